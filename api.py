@@ -13,42 +13,124 @@ Key improvements:
 """
 
 from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, Request, Depends, Query
-from fastapi.responses import FileResponse, JSONResponse, RedirectResponse, HTMLResponse, StreamingResponse
+from fastapi.responses import Response, FileResponse, JSONResponse, RedirectResponse, HTMLResponse, StreamingResponse
+from fastapi.routing import APIRoute
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, EmailStr
 from typing import Optional, List, Dict
 import uvicorn
+import aiofiles
+import aiofiles.os
 import os
 import uuid
 import time
 import json
 import hashlib
-from datetime import datetime, timedelta
+import hmac
+import secrets
+import logging
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import mmap
+import zlib
+from datetime import datetime
 import shutil
 import sys
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import threading
-from queue import Queue
+from queue import Queue, SimpleQueue, Empty
+from collections import Counter, OrderedDict
 import traceback
 
+# Optional Redis backend for users/sessions/payments
+try:
+    import redis
+    REDIS_SUPPORT = True
+except ImportError:
+    REDIS_SUPPORT = False
+
+# Optional orjson for faster JSON store and response serialization
+try:
+    import orjson
+    ORJSON_SUPPORT = True
+except ImportError:
+    ORJSON_SUPPORT = False
+
+# Optional uvloop/httptools (installed by uvicorn[standard]) for the server
+try:
+    import uvloop
+    UVLOOP_SUPPORT = True
+except ImportError:
+    UVLOOP_SUPPORT = False
+
+try:
+    import httptools
+    HTTPTOOLS_SUPPORT = True
+except ImportError:
+    HTTPTOOLS_SUPPORT = False
+
+# Optional argon2 password hashing (falls back to salted scrypt)
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import VerificationError, InvalidHashError
+    # Cost is tunable per deployment (defaults are argon2-cffi's RFC 9106
+    # low-memory profile); hashes made with other settings are upgraded at
+    # the next sign-in via check_needs_rehash
+    password_hasher = PasswordHasher(
+        time_cost=int(os.getenv("ARGON2_TIME_COST", "3")),
+        memory_cost=int(os.getenv("ARGON2_MEMORY_KIB", "65536")),
+        parallelism=int(os.getenv("ARGON2_PARALLELISM", "4"))
+    )
+    ARGON2_SUPPORT = True
+except ImportError:
+    ARGON2_SUPPORT = False
+
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(__file__))
 
 # Import the improved DocumentTranslator
 try:
-    from document_translator import DocumentTranslator
+    from document_translator import DocumentTranslator, TranslationAborted
     TRANSLATOR_AVAILABLE = True
 except ImportError:
     TRANSLATOR_AVAILABLE = False
+    TranslationAborted = Exception
     print("WARNING: document_translator not available!")
 
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with dumps_json (orjson when available)"""
+    
+    def render(self, content) -> bytes:
+        return dumps_json(content)
+
+class FastJSONRequest(Request):
+    """Request whose JSON body is parsed with loads_json (orjson when available)"""
+    
+    async def json(self):
+        if not hasattr(self, "_json"):
+            self._json = loads_json(await self.body())
+        return self._json
+
+class FastJSONRoute(APIRoute):
+    """Route that hands FastAPI a FastJSONRequest for body parsing"""
+    
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        
+        async def route_handler(request: Request):
+            return await handler(FastJSONRequest(request.scope, request.receive))
+        
+        return route_handler
+
 app = FastAPI(
     title="Document Translation API - Enhanced for Large Files",
     description="With background processing and progress tracking",
-    version="4.0.0"
+    version="4.0.0",
+    default_response_class=FastJSONResponse
 )
+app.router.route_class = FastJSONRoute  # Must be set before any route is added
 
 # ============================================
 # CONFIGURATION
@@ -59,11 +141,46 @@ FRONTEND_URL = os.getenv("FRONTEND_URL", "https://translation-app-frontend-lhk5.
 
 # File size limits
 MAX_FILE_SIZE_MB = 100  # Maximum file size in MB
-CHUNK_SIZE_KB = 1024  # Chunk size for reading large files
+CHUNK_SIZE_KB = 1024  # 1 MiB chunks for copying uploads and sending downloads
+UPLOAD_BUFFER_POOL_SIZE = 8  # Idle upload copy buffers kept for reuse
+
+# Logging (LOG_LEVEL=DEBUG shows per-request details)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+SLOW_REQUEST_SECONDS = 1.0  # Successful requests slower than this are logged at INFO
+# Request handlers and worker threads only enqueue records; a listener
+# thread formats them and writes to stdout, off the request path
+log_queue = Queue(-1)
+# Escape characters the console can't encode (e.g. emoji in file names on
+# a cp1252 terminal) instead of failing the log write
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(errors="backslashreplace")
+log_handler = logging.StreamHandler(sys.stdout)
+log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+log_listener = QueueListener(log_queue, log_handler)
+queue_handler = QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter("%(message)s"))  # Final format is applied by log_handler
+logging.basicConfig(level=LOG_LEVEL, handlers=[queue_handler])
+log_listener.start()
+atexit.register(log_listener.stop)  # Drains queued records on exit
+logger = logging.getLogger("translation_api")
+if not ARGON2_SUPPORT:
+    logger.warning("argon2-cffi not available - using scrypt password hashes")
+
+# Storage settings
+REDIS_URL = os.getenv("REDIS_URL", "")  # Enables Redis storage when set
+SESSION_TTL_SECONDS = 86400  # Sessions expire after 1 day
+FLUSH_INTERVAL_SECONDS = 1.0  # Max delay before changed JSON stores are written
 
 # Translation settings
 TRANSLATION_TIMEOUT = 1800  # 30 minutes timeout for translation
-MAX_CONCURRENT_TRANSLATIONS = 3  # Max translations running at once
+MAX_CONCURRENT_TRANSLATIONS = int(os.getenv("MAX_CONCURRENT_TRANSLATIONS", "3"))  # Max translations running at once
+MAX_QUEUED_TRANSLATIONS = 20  # Max background translations running or waiting
+TRANSLATOR_CACHE_LIMIT = 20000  # Cached segments kept on a pooled translator
+SHARED_CACHE_LIMIT = 50000  # Segments kept in the in-process shared cache
+SHARED_CACHE_TTL_SECONDS = 14 * 86400  # Shared cache entry lifetime in Redis
+DOCUMENT_CACHE_SIZE = 10000  # Document records kept in memory
+TASK_RETENTION_HOURS = 24  # Finished and stale tasks are dropped after this
+TASK_CLEANUP_INTERVAL_SECONDS = 60  # How often expired tasks are removed
 
 # Paystack Configuration - Multiple Payment Links for Different Tiers
 PAYSTACK_PAYMENT_LINKS = {
@@ -72,6 +189,17 @@ PAYSTACK_PAYMENT_LINKS = {
 }
 PAYSTACK_SECRET_KEY = os.getenv("PAYSTACK_SECRET_KEY", "")
 
+# Current time as an ISO string, rebuilt at most once per second - status
+# updates and records only need second precision
+_now_iso_cache = (0, "")
+
+def now_iso() -> str:
+    global _now_iso_cache
+    second = int(time.time())
+    if second != _now_iso_cache[0]:
+        _now_iso_cache = (second, datetime.fromtimestamp(second).isoformat())
+    return _now_iso_cache[1]
+
 # ============================================
 # BACKGROUND TASK MANAGER
 # ============================================
@@ -81,9 +209,11 @@ class TranslationTaskManager:
     
     def __init__(self):
         self.tasks = {}
+        self.user_tasks = {}  # user_id -> task_ids in creation order
+        self.status_counts = Counter()  # status -> number of tasks
         self.executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_TRANSLATIONS)
         self.lock = threading.Lock()
-        self.queue = Queue()
+        self.slots = threading.BoundedSemaphore(MAX_QUEUED_TRANSLATIONS)
         
     def add_task(self, task_id, user_id, doc_info):
         """Add a new translation task"""
@@ -95,47 +225,146 @@ class TranslationTaskManager:
                 "status": "queued",
                 "progress": 0,
                 "message": "Waiting in queue...",
-                "created_at": datetime.now().isoformat(),
+                "created_at": now_iso(),
+                "created_ts": time.time(),  # Epoch seconds, for expiry
                 "started_at": None,
                 "completed_at": None,
                 "error": None,
                 "result": None
             }
+            self.user_tasks.setdefault(user_id, []).append(task_id)
+            self.status_counts["queued"] += 1
         return self.tasks[task_id]
     
+    def acquire_slot(self):
+        """Reserve a queue slot; False if the queue is full"""
+        return self.slots.acquire(blocking=False)
+    
+    def release_slot(self):
+        """Give back a slot reserved with acquire_slot that was never submitted"""
+        self.slots.release()
+    
+    def submit(self, fn, *args):
+        """Run work on the executor, releasing its reserved slot when done"""
+        def run():
+            try:
+                fn(*args)
+            finally:
+                self.slots.release()
+        return self.executor.submit(run)
+    
     def update_task(self, task_id, **kwargs):
         """Update task status"""
         with self.lock:
             if task_id in self.tasks:
+                if "status" in kwargs:
+                    self.status_counts[self.tasks[task_id]["status"]] -= 1
+                    self.status_counts[kwargs["status"]] += 1
                 self.tasks[task_id].update(kwargs)
-                self.tasks[task_id]["updated_at"] = datetime.now().isoformat()
+                self.tasks[task_id]["updated_at"] = now_iso()
+    
+    def transition(self, task_id, from_statuses, status, **kwargs) -> bool:
+        """
+        Move a task to status only if it is currently in from_statuses
+        (checked and applied under the lock); False if it wasn't
+        """
+        with self.lock:
+            task = self.tasks.get(task_id)
+            if task is None or task["status"] not in from_statuses:
+                return False
+            self.status_counts[task["status"]] -= 1
+            self.status_counts[status] += 1
+            task.update(kwargs, status=status, updated_at=now_iso())
+            return True
     
     def get_task(self, task_id):
         """Get task status"""
-        with self.lock:
-            return self.tasks.get(task_id)
+        # A single dict.get is atomic under the GIL, so status polling
+        # doesn't queue up behind the lock writers hold
+        return self.tasks.get(task_id)
     
     def get_user_tasks(self, user_id):
         """Get all tasks for a user"""
         with self.lock:
-            return [task for task in self.tasks.values() if task["user_id"] == user_id]
+            return [self.tasks[task_id] for task_id in self.user_tasks.get(user_id, [])]
     
-    def cleanup_old_tasks(self, hours=24):
-        """Remove tasks older than specified hours"""
-        cutoff_time = datetime.now() - timedelta(hours=hours)
+    def count_by_status(self, status):
+        """Number of tasks currently in a status"""
+        return self.status_counts[status]
+    
+    def get_recent_user_tasks(self, user_id, limit=10):
+        """Get a user's most recent tasks, newest first"""
+        with self.lock:
+            task_ids = self.user_tasks.get(user_id, [])[-limit:]
+            return [self.tasks[task_id] for task_id in reversed(task_ids)]
+    
+    def cleanup_old_tasks(self, hours=TASK_RETENTION_HOURS):
+        """Remove tasks older than specified hours; returns how many"""
+        cutoff_time = time.time() - hours * 3600
         with self.lock:
+            # Tasks are stored in creation order, so the expired ones form a
+            # prefix - stop at the first live task instead of scanning them all
             old_tasks = []
             for task_id, task in self.tasks.items():
-                created_at = datetime.fromisoformat(task["created_at"])
-                if created_at < cutoff_time:
-                    old_tasks.append(task_id)
+                if task["created_ts"] >= cutoff_time:
+                    break
+                old_tasks.append(task_id)
             
+            affected_users = set()
             for task_id in old_tasks:
-                del self.tasks[task_id]
+                task = self.tasks.pop(task_id)
+                affected_users.add(task["user_id"])
+                self.status_counts[task["status"]] -= 1
+            
+            for user_id in affected_users:
+                remaining = [t for t in self.user_tasks[user_id] if t in self.tasks]
+                if remaining:
+                    self.user_tasks[user_id] = remaining
+                else:
+                    del self.user_tasks[user_id]
+        return len(old_tasks)
 
 # Initialize task manager
 task_manager = TranslationTaskManager()
 
+class TranslatorPool:
+    """Reuses idle DocumentTranslator instances per language pair"""
+    
+    def __init__(self, max_idle_per_pair=MAX_CONCURRENT_TRANSLATIONS):
+        self.idle = {}
+        self.max_idle_per_pair = max_idle_per_pair
+        self.lock = threading.Lock()
+    
+    def acquire(self, source_lang, target_lang):
+        """Get a translator for exclusive use by one translation"""
+        with self.lock:
+            pool = self.idle.get((source_lang, target_lang))
+            translator = pool.pop() if pool else None
+        
+        if translator is None:
+            return DocumentTranslator(
+                source_lang=source_lang,
+                target_lang=target_lang,
+                shared_cache=shared_translation_cache
+            )
+        
+        translator.reset_document_state()
+        return translator
+    
+    def release(self, translator):
+        """Return a translator after a successful translation"""
+        if len(translator.translation_cache) > TRANSLATOR_CACHE_LIMIT:
+            translator.translation_cache.clear()
+            translator.context_cache.clear()
+        
+        with self.lock:
+            pool = self.idle.setdefault((translator.source_lang, translator.target_lang), [])
+            if len(pool) < self.max_idle_per_pair:
+                pool.append(translator)
+
+# Initialize translator pool
+translator_pool = TranslatorPool()
+
 # ============================================
 # CORS
 # ============================================
@@ -158,48 +387,52 @@ app.add_middleware(
 # REQUEST LOGGING MIDDLEWARE
 # ============================================
 
+# Polled and static endpoints that aren't worth a log line
+LOG_SKIP_PATHS = {"/", "/health", "/openapi.json"}
+LOG_SKIP_PREFIXES = ("/docs", "/redoc")
+
+def skip_request_log(path):
+    """True for health checks, docs and task status polls"""
+    return (
+        path in LOG_SKIP_PATHS
+        or path.startswith(LOG_SKIP_PREFIXES)
+        or (path.startswith("/task/") and path.endswith("/status"))
+    )
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Log all requests for debugging"""
-    start_time = time.time()
-    
-    # Skip logging for health/status endpoints
-    if request.url.path in ["/health", "/", "/task/status"]:
-        response = await call_next(request)
-        return response
-    
-    print(f"\n{'='*70}")
-    print(f"📥 INCOMING REQUEST")
-    print(f"{'='*70}")
-    print(f"Method:  {request.method}")
-    print(f"Path:    {request.url.path}")
-    print(f"Client:  {request.client.host if request.client else 'Unknown'}")
-    
-    # Check for auth header
-    auth_header = request.headers.get("authorization")
-    if auth_header:
-        token = auth_header.replace("Bearer ", "")[:20]
-        print(f"Auth:    ✓ Present (token: {token}...)")
-    else:
-        print(f"Auth:    ✗ MISSING")
-    
-    print(f"{'='*70}")
+    # Skip logging for health/status endpoints (/task/{task_id}/status is
+    # polled several times a second while a translation runs)
+    if skip_request_log(request.url.path):
+        return await call_next(request)
     
+    start_time = time.perf_counter()
     response = await call_next(request)
     
-    process_time = time.time() - start_time
-    
-    print(f"📤 RESPONSE")
-    print(f"{'='*70}")
-    print(f"Status:  {response.status_code}")
-    print(f"Time:    {process_time:.2f}s")
-    
+    process_time = time.perf_counter() - start_time
+    # Failures and slow requests are always worth a line; routine ones only
+    # at DEBUG, so the default level builds no record for them at all
     if response.status_code >= 400:
-        print(f"❌ ERROR RESPONSE")
+        level = logging.WARNING
+    elif process_time > SLOW_REQUEST_SECONDS:
+        level = logging.INFO
     else:
-        print(f"✓ SUCCESS")
+        level = logging.DEBUG
+    if not logger.isEnabledFor(level):
+        return response
     
-    print(f"{'='*70}\n")
+    # One queued record per request; the listener thread does the I/O
+    logger.log(
+        level,
+        "%s %s -> %s in %.3fs (client=%s, auth=%s)",
+        request.method,
+        request.url.path,
+        response.status_code,
+        process_time,
+        request.client.host if request.client else "unknown",
+        "present" if request.headers.get("authorization") else "missing"
+    )
     
     return response
 
@@ -218,31 +451,708 @@ USERS_FILE = os.path.join(DATA_DIR, "users.json")
 PAYMENTS_FILE = os.path.join(DATA_DIR, "payments.json")
 SESSIONS_FILE = os.path.join(DATA_DIR, "sessions.json")
 PENDING_UPGRADES_FILE = os.path.join(DATA_DIR, "pending_upgrades.json")
+DOCS_DIR = os.path.join(DATA_DIR, "docs")  # One JSON file per document
+JOURNAL_COMPACT_RECORDS = 1000  # Journal lines before a store's snapshot is rewritten
 
 # Storage functions
+def dumps_json(data) -> bytes:
+    """Serialize to compact JSON bytes (orjson when available)"""
+    if ORJSON_SUPPORT:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+def loads_json(payload):
+    """Parse JSON from str, bytes or a buffer view (orjson when available)"""
+    if ORJSON_SUPPORT:
+        return orjson.loads(payload)
+    if isinstance(payload, str):
+        return json.loads(payload)
+    return json.loads(bytes(payload))
+
 def load_json(filename):
     if os.path.exists(filename):
         try:
-            with open(filename, 'r') as f:
-                return json.load(f)
+            # Parse straight from the page cache instead of copying via read()
+            with open(filename, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as view:
+                        return loads_json(view)
         except Exception as e:
-            print(f"Error loading {filename}: {e}")
+            logger.error("Error loading %s: %s", filename, e)
             return {}
     return {}
 
-def save_json(filename, data):
+def write_json_file(filename, payload: bytes):
+    """Atomically replace a JSON file so a crash never leaves it half-written"""
+    # Per-thread temp name so concurrent writers never replace each other's file
+    tmp_path = f"{filename}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, filename)
+
+# Redis client (None means JSON file storage is used)
+redis_client = None
+if REDIS_SUPPORT and REDIS_URL:
     try:
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
+        redis_client = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+        redis_client.ping()
+        logger.info("Redis storage enabled")
     except Exception as e:
-        print(f"Error saving {filename}: {e}")
+        logger.warning("Redis unavailable (%s) - falling back to JSON files", e)
+        redis_client = None
 
-# In-memory storage
-users = load_json(USERS_FILE)
-payments = load_json(PAYMENTS_FILE)
-sessions = load_json(SESSIONS_FILE)
+class SharedTranslationCache:
+    """
+    Segment translations shared by every translator, so text repeated
+    across documents and users is only sent to Google Translate once.
+    Stored in Redis when enabled, otherwise in a bounded in-process LRU.
+    """
+    
+    def __init__(self, client=None, max_size=SHARED_CACHE_LIMIT, ttl=SHARED_CACHE_TTL_SECONDS):
+        self.client = client
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        if self.client:
+            value = self.client.get(f"translate:v1:{key}")
+            return default if value is None else value
+        with self.lock:
+            if key not in self.entries:
+                return default
+            self.entries.move_to_end(key)
+            return self.entries[key]
+    
+    def __setitem__(self, key, value):
+        if self.client:
+            self.client.set(f"translate:v1:{key}", value, ex=self.ttl)
+            return
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+shared_translation_cache = SharedTranslationCache(redis_client)
+
+# In-memory storage (left empty when Redis is enabled - nothing is mirrored)
+if redis_client:
+    users = {}
+    payments = {}
+    sessions = {}
+else:
+    users = load_json(USERS_FILE)
+    payments = load_json(PAYMENTS_FILE)
+    sessions = load_json(SESSIONS_FILE)
 pending_upgrades = load_json(PENDING_UPGRADES_FILE)
-documents = {}
+
+class DocumentStore:
+    """
+    Document metadata with a bounded in-memory LRU in front of one JSON
+    file per document. Records are written through on save(), and evicted
+    ones are loaded back from disk on demand. When Redis is enabled each
+    record is a JSON string under doc:<id> instead, read from Redis every
+    time so all workers see the same status.
+    """
+    
+    def __init__(self, directory, client=None, max_size=DOCUMENT_CACHE_SIZE):
+        self.directory = directory
+        self.client = client
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.doc_ids = set()  # Every document on record
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+    
+    def _path(self, doc_id):
+        return os.path.join(self.directory, f"{doc_id}.json")
+    
+    def _remember(self, doc):
+        self.entries[doc["doc_id"]] = doc
+        self.entries.move_to_end(doc["doc_id"])
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+    
+    def get(self, doc_id) -> Optional[dict]:
+        """Get a document record, or None if it doesn't exist"""
+        if self.client:
+            payload = self.client.get(f"doc:{doc_id}")
+            return loads_json(payload) if payload is not None else None
+        with self.lock:
+            doc = self.entries.get(doc_id)
+            if doc is not None:
+                self.entries.move_to_end(doc_id)
+                return doc
+            if doc_id not in self.doc_ids:
+                return None
+        doc = load_json(self._path(doc_id))
+        if not doc:
+            return None
+        with self.lock:
+            # Another request may have loaded it meanwhile - keep one copy
+            if doc_id in self.entries:
+                return self.entries[doc_id]
+            self._remember(doc)
+        return doc
+    
+    def cached(self, doc_ids) -> bool:
+        """True if reading these records needs no disk or network access"""
+        if self.client:
+            return False
+        with self.lock:
+            return all(doc_id in self.entries or doc_id not in self.doc_ids for doc_id in doc_ids)
+    
+    def get_many(self, doc_ids) -> List[dict]:
+        """Get several document records (one round trip with Redis), skipping missing ones"""
+        if self.client:
+            if not doc_ids:
+                return []
+            payloads = self.client.mget([f"doc:{doc_id}" for doc_id in doc_ids])
+            return [loads_json(payload) for payload in payloads if payload is not None]
+        return [doc for doc in map(self.get, doc_ids) if doc is not None]
+    
+    def save(self, doc: dict):
+        """Store a new or changed document record"""
+        if self.client:
+            pipe = self.client.pipeline()
+            pipe.set(f"doc:{doc['doc_id']}", dumps_json(doc))
+            pipe.sadd("docs", doc["doc_id"])
+            pipe.execute()
+            return
+        with self.lock:
+            self._remember(doc)
+            self.doc_ids.add(doc["doc_id"])
+            payload = dumps_json(doc)
+        write_json_file(self._path(doc["doc_id"]), payload)
+    
+    async def asave(self, doc: dict):
+        """save() from a worker thread so handlers don't block on the disk write"""
+        await asyncio.to_thread(self.save, doc)
+    
+    def load_index(self) -> dict:
+        """Scan saved records once; returns user_id -> doc_ids in upload order"""
+        if self.client:
+            return {}  # Redis keeps the per-user lists (user:docs:<id>)
+        by_user = {}
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            doc = load_json(os.path.join(self.directory, name))
+            if not doc:
+                continue
+            self.doc_ids.add(doc["doc_id"])
+            by_user.setdefault(doc["user_id"], []).append((doc["upload_time"], doc["doc_id"]))
+        return {
+            user_id: [doc_id for _, doc_id in sorted(entries)]
+            for user_id, entries in by_user.items()
+        }
+    
+    def __len__(self):
+        if self.client:
+            return self.client.scard("docs")
+        return len(self.doc_ids)
+
+documents = DocumentStore(DOCS_DIR, redis_client)
+user_documents = documents.load_index()  # user_id -> doc_ids in upload order
+
+def add_user_document(user_id: str, doc_id: str):
+    """Append a new upload to the user's document index"""
+    if redis_client:
+        redis_client.rpush(f"user:docs:{user_id}", doc_id)
+        return
+    user_documents.setdefault(user_id, []).append(doc_id)
+
+def get_user_document_ids(user_id: str) -> List[str]:
+    """A user's doc IDs in upload order"""
+    if redis_client:
+        return redis_client.lrange(f"user:docs:{user_id}", 0, -1)
+    return user_documents.get(user_id, [])
+
+# Debounced persistence: mutations mark a store dirty and the background
+# flusher writes it at most once per FLUSH_INTERVAL_SECONDS
+json_stores = {
+    USERS_FILE: users,
+    PAYMENTS_FILE: payments,
+    SESSIONS_FILE: sessions,
+    PENDING_UPGRADES_FILE: pending_upgrades
+}
+dirty_files = set()
+dirty_event = asyncio.Event()  # Wakes the flusher; set only on its event loop
+flusher_loop = None  # Event loop running the flusher (set at startup)
+
+def mark_dirty(filename):
+    """Schedule a JSON store to be written by the flusher"""
+    dirty_files.add(filename)
+    wake_flusher()
+
+def wake_flusher():
+    """Tell the flusher there is something to write"""
+    if flusher_loop is not None:
+        # May be called from translation worker threads
+        try:
+            flusher_loop.call_soon_threadsafe(dirty_event.set)
+        except RuntimeError:
+            pass  # Loop already closed - shutdown flushes synchronously
+
+def append_file(filename, payload: bytes):
+    with open(filename, 'ab') as f:
+        f.write(payload)
+
+def file_crc(filename):
+    """CRC32 of a file's contents, or None if it doesn't exist"""
+    try:
+        with open(filename, 'rb') as f:
+            return zlib.crc32(f.read())
+    except FileNotFoundError:
+        return None
+
+class JournaledStore:
+    """
+    A dict persisted as a JSON snapshot plus an append-only NDJSON journal.
+    Each mutation queues one small {"op", "k", "v"} record; the flusher
+    appends queued records with a single write and rewrites the snapshot
+    (truncating the journal) every JOURNAL_COMPACT_RECORDS records. Records
+    hold absolute values, so replaying one twice is harmless.
+    
+    The journal starts with a {"snapshot": <crc32>} header naming the
+    snapshot it follows. A crash after a snapshot is written but before the
+    journal is truncated leaves a header that no longer matches, and replay
+    skips those already-folded-in records instead of applying them over
+    newer data.
+    """
+    
+    def __init__(self, filename, data):
+        self.filename = filename
+        self.journal_filename = os.path.splitext(filename)[0] + ".journal.ndjson"
+        self.data = data
+        self.lock = threading.Lock()
+        self.pending = []  # Encoded records not yet appended to the journal
+        self.records = 0  # Records in the journal since the last snapshot
+        self.journal_started = False  # Header written for the current snapshot
+    
+    def _queue(self, op, key, value=None):
+        """Queue a journal record (caller holds the lock)"""
+        record = {"op": op, "k": key}
+        if value is not None:
+            record["v"] = value
+        self.pending.append(dumps_json(record) + b"\n")
+    
+    def put(self, key, value):
+        """Insert or replace a record"""
+        with self.lock:
+            self.data[key] = value
+            self._queue("put", key, value)
+        wake_flusher()
+    
+    def update(self, key, **fields):
+        """Set fields on an existing record"""
+        with self.lock:
+            self.data[key].update(fields)
+            self._queue("update", key, fields)
+        wake_flusher()
+    
+    def increment(self, key, field, **fields):
+        """Atomically add one to a counter field (and set other fields)"""
+        with self.lock:
+            record = self.data[key]
+            record[field] += 1
+            record.update(fields)
+            self._queue("update", key, {field: record[field], **fields})
+        wake_flusher()
+        return record[field]
+    
+    def delete(self, key):
+        """Remove a record if present"""
+        with self.lock:
+            if self.data.pop(key, None) is None:
+                return
+            self._queue("del", key)
+        wake_flusher()
+    
+    def snapshot(self) -> bytes:
+        """Serialize the dict; the snapshot supersedes queued records"""
+        with self.lock:
+            payload = dumps_json(self.data)
+            self.pending.clear()
+        return payload
+    
+    def truncate_journal(self, snapshot_crc):
+        """Start an empty journal following the snapshot with this CRC"""
+        with open(self.journal_filename, 'wb') as f:
+            f.write(dumps_json({"snapshot": snapshot_crc}) + b"\n")
+        self.records = 0
+        self.journal_started = True
+    
+    def start_journal(self):
+        """Start a journal following the snapshot currently on disk"""
+        self.truncate_journal(file_crc(self.filename))
+    
+    def replay(self) -> int:
+        """Apply journal records written after the last snapshot"""
+        if not os.path.exists(self.journal_filename):
+            return 0
+        snapshot_crc = file_crc(self.filename)
+        count = 0
+        with open(self.journal_filename, 'rb') as f:
+            for line in f:
+                try:
+                    record = loads_json(line)
+                except ValueError:
+                    continue  # Torn last line from a crash mid-append
+                if "snapshot" in record:
+                    if record["snapshot"] != snapshot_crc:
+                        return 0  # Written before the current snapshot
+                    continue
+                if "op" not in record:
+                    continue  # Not a journal record
+                key = record["k"]
+                if record["op"] == "put":
+                    self.data[key] = record["v"]
+                elif record["op"] == "del":
+                    self.data.pop(key, None)
+                elif key in self.data:
+                    self.data[key].update(record["v"])
+                count += 1
+        return count
+    
+    async def flush_journal(self):
+        """Append queued records with a single write"""
+        with self.lock:
+            if not self.pending:
+                return
+            payload = b"".join(self.pending)
+            count = len(self.pending)
+            self.pending.clear()
+        try:
+            if not self.journal_started:
+                # Anything already in the file is covered by the snapshot:
+                # a journal with live records marks the store dirty at
+                # startup, and that compaction runs before this append
+                await asyncio.to_thread(self.start_journal)
+            await asyncio.to_thread(append_file, self.journal_filename, payload)
+        except Exception as e:
+            logger.error("Error appending to %s: %s", self.journal_filename, e)
+            mark_dirty(self.filename)  # Fall back to a full snapshot
+            return
+        self.records += count
+        if self.records >= JOURNAL_COMPACT_RECORDS:
+            mark_dirty(self.filename)
+
+users_store = JournaledStore(USERS_FILE, users)
+sessions_store = JournaledStore(SESSIONS_FILE, sessions)
+payments_store = JournaledStore(PAYMENTS_FILE, payments)
+pending_upgrades_store = JournaledStore(PENDING_UPGRADES_FILE, pending_upgrades)
+journaled_stores = {
+    store.filename: store
+    for store in (users_store, sessions_store, payments_store, pending_upgrades_store)
+}
+
+def snapshot_json_store(filename) -> bytes:
+    """Serialize a store for a full rewrite"""
+    if filename in journaled_stores:
+        return journaled_stores[filename].snapshot()
+    return dumps_json(json_stores[filename])
+
+async def flush_dirty_files():
+    """Write all dirty JSON stores to disk, then append journal records"""
+    while dirty_files:
+        filename = dirty_files.pop()
+        try:
+            # Serialize on the event loop so request handlers can't interleave
+            payload = snapshot_json_store(filename)
+        except RuntimeError:
+            # Mutated by a worker thread mid-serialization - retry next tick
+            dirty_files.add(filename)
+            return
+        try:
+            await asyncio.to_thread(write_json_file, filename, payload)
+            if filename in journaled_stores:
+                await asyncio.to_thread(journaled_stores[filename].truncate_journal,
+                                        zlib.crc32(payload))
+        except Exception as e:
+            logger.error("Error saving %s: %s", filename, e)
+            dirty_files.add(filename)
+            return
+    for store in journaled_stores.values():
+        await store.flush_journal()
+
+def flush_dirty_files_sync():
+    """Compact every store to its JSON file (used on shutdown)"""
+    for store in journaled_stores.values():
+        if store.pending or store.records:
+            dirty_files.add(store.filename)
+    while dirty_files:
+        filename = dirty_files.pop()
+        try:
+            payload = snapshot_json_store(filename)
+            write_json_file(filename, payload)
+            if filename in journaled_stores:
+                journaled_stores[filename].truncate_journal(zlib.crc32(payload))
+        except Exception as e:
+            logger.error("Error saving %s: %s", filename, e)
+
+# Rebuild stores from their last snapshot plus the journal (with Redis,
+# only pending upgrades are still kept in a local file)
+for _store in journaled_stores.values():
+    if redis_client and _store is not pending_upgrades_store:
+        continue
+    if _store.replay():
+        mark_dirty(_store.filename)
+
+def import_json_into_redis():
+    """
+    Copy the JSON-file data into Redis the first time REDIS_URL is used, so
+    existing accounts, sessions, payments and documents carry over. A marker
+    key makes it run once per Redis database, even with several workers.
+    """
+    if not redis_client.set("migrated:json", now_iso(), nx=True):
+        return
+    try:
+        # Snapshot plus journal, as the JSON backend would load them
+        local = {}
+        for filename in (USERS_FILE, SESSIONS_FILE, PAYMENTS_FILE):
+            store = JournaledStore(filename, load_json(filename))
+            store.replay()
+            local[filename] = store.data
+        
+        pipe = redis_client.pipeline()
+        imported_users = set()
+        for user_id, user in local[USERS_FILE].items():
+            # An email already registered in Redis keeps its Redis account
+            email_key = f"user:email:{user['email'].lower()}"
+            if not (redis_client.set(email_key, user_id, nx=True) or redis_client.get(email_key) == user_id):
+                continue
+            pipe.hset(f"user:{user_id}", mapping={k: v for k, v in user.items() if v is not None})
+            pipe.sadd("users", user_id)
+            imported_users.add(user_id)
+        
+        now = time.time()
+        session_count = 0
+        for token, session in local[SESSIONS_FILE].items():
+            created_at = session["created_at"]
+            if isinstance(created_at, str):
+                created_at = datetime.fromisoformat(created_at).timestamp()
+            remaining = int(created_at + SESSION_TTL_SECONDS - now)
+            if remaining <= 0 or session["user_id"] not in imported_users:
+                continue
+            pipe.set(f"sess:{token}", session["user_id"], ex=remaining, nx=True)
+            pipe.sadd(f"user:sessions:{session['user_id']}", token)
+            pipe.expire(f"user:sessions:{session['user_id']}", SESSION_TTL_SECONDS)
+            pipe.zadd("sessions:expiry", {token: created_at + SESSION_TTL_SECONDS})
+            session_count += 1
+        
+        for payment_id, payment in local[PAYMENTS_FILE].items():
+            pipe.hset(f"payment:{payment_id}", mapping={k: v for k, v in payment.items() if v is not None})
+            pipe.sadd("payments", payment_id)
+        pipe.execute()
+        
+        # Document records, appended to each user's list in upload order
+        by_user = {}
+        for name in os.listdir(DOCS_DIR):
+            if not name.endswith(".json"):
+                continue
+            doc = load_json(os.path.join(DOCS_DIR, name))
+            if doc and redis_client.set(f"doc:{doc['doc_id']}", dumps_json(doc), nx=True):
+                by_user.setdefault(doc["user_id"], []).append((doc["upload_time"], doc["doc_id"]))
+        pipe = redis_client.pipeline()
+        for user_id, entries in by_user.items():
+            pipe.sadd("docs", *(doc_id for _, doc_id in entries))
+            pipe.rpush(f"user:docs:{user_id}", *(doc_id for _, doc_id in sorted(entries)))
+        pipe.execute()
+    except Exception as e:
+        # Let the next start try again (every step above is repeatable)
+        redis_client.delete("migrated:json")
+        logger.error("Importing JSON data into Redis failed: %s", e)
+        return
+    
+    logger.info("Imported %d users, %d sessions, %d payments and %d documents into Redis",
+                len(imported_users), session_count, len(local[PAYMENTS_FILE]),
+                sum(map(len, by_user.values())))
+
+if redis_client:
+    import_json_into_redis()
+
+# Email -> user_id index for O(1) lookups in sign-in/sign-up
+email_index = {u["email"].lower(): uid for uid, u in users.items()}
+
+# user_id -> session tokens index for O(1) sign-out
+user_sessions = {}
+for _token, _session in sessions.items():
+    user_sessions.setdefault(_session["user_id"], set()).add(_token)
+    # Convert sessions saved with ISO timestamps to epoch seconds
+    if isinstance(_session["created_at"], str):
+        _session["created_at"] = datetime.fromisoformat(_session["created_at"]).timestamp()
+
+def get_user(user_id: str) -> Optional[dict]:
+    """Get a user record by ID"""
+    if redis_client:
+        user = redis_client.hgetall(f"user:{user_id}")
+        if not user:
+            return None
+        user["translations_used"] = int(user.get("translations_used", 0))
+        return user
+    return users.get(user_id)
+
+def claim_email(email: str, user_id: str) -> bool:
+    """Reserve an email for a new user; False if it is already taken"""
+    key = email.lower()
+    if redis_client:
+        return bool(redis_client.set(f"user:email:{key}", user_id, nx=True))
+    return email_index.setdefault(key, user_id) == user_id
+
+def save_user(user: dict):
+    """Persist a new user record"""
+    if redis_client:
+        pipe = redis_client.pipeline()
+        pipe.hset(f"user:{user['user_id']}", mapping=user)
+        pipe.set(f"user:email:{user['email'].lower()}", user["user_id"])
+        pipe.sadd("users", user["user_id"])
+        pipe.execute()
+    else:
+        email_index[user["email"].lower()] = user["user_id"]
+        users_store.put(user["user_id"], user)
+
+def update_user(user_id: str, **fields) -> Optional[dict]:
+    """Update fields on an existing user record"""
+    user = get_user(user_id)
+    if user is None:
+        return None
+    if redis_client:
+        user.update(fields)
+        redis_client.hset(f"user:{user_id}", mapping=fields)
+    else:
+        users_store.update(user_id, **fields)
+    return user
+
+def increment_translations_used(user_id: str) -> Optional[dict]:
+    """Increment a user's translation count"""
+    user = get_user(user_id)
+    if user is None:
+        return None
+    now = now_iso()
+    if redis_client:
+        user["translations_used"] = redis_client.hincrby(f"user:{user_id}", "translations_used", 1)
+        redis_client.hset(f"user:{user_id}", "updated_at", now)
+        user["updated_at"] = now
+    else:
+        users_store.increment(user_id, "translations_used", updated_at=now)
+    return user
+
+def create_session(user_id: str) -> str:
+    """Create a session for a user and return its token"""
+    token = generate_token()
+    now = time.time()  # Epoch seconds - cheap to compare in verify_token
+    
+    if redis_client:
+        # Nothing is mirrored locally: sess:<token> expires through its TTL,
+        # and sessions:expiry (token -> expiry time) is trimmed here so it
+        # can be counted for /health
+        key = f"user:sessions:{user_id}"
+        tokens = list(redis_client.smembers(key))
+        expired = []
+        if tokens:
+            alive = redis_client.mget([f"sess:{t}" for t in tokens])
+            expired = [t for t, value in zip(tokens, alive) if value is None]
+        pipe = redis_client.pipeline()
+        pipe.set(f"sess:{token}", user_id, ex=SESSION_TTL_SECONDS)
+        if expired:
+            pipe.srem(key, *expired)
+        pipe.sadd(key, token)
+        pipe.expire(key, SESSION_TTL_SECONDS)
+        pipe.zadd("sessions:expiry", {token: now + SESSION_TTL_SECONDS})
+        pipe.zremrangebyscore("sessions:expiry", "-inf", now)
+        pipe.execute()
+        return token
+    
+    # Expired sessions are otherwise only dropped when presented again, so
+    # prune this user's before adding another - keeps the index bounded
+    tokens = user_sessions.setdefault(user_id, set())
+    cutoff = now - SESSION_TTL_SECONDS
+    expired = [t for t in tokens if sessions.get(t, {}).get("created_at", 0) < cutoff]
+    tokens.difference_update(expired)
+    tokens.add(token)
+    for expired_token in expired:
+        sessions_store.delete(expired_token)
+    sessions_store.put(token, {"user_id": user_id, "created_at": now})
+    return token
+
+def delete_session(token: str, user_id: str):
+    """Remove a single session token"""
+    if redis_client:
+        pipe = redis_client.pipeline()
+        pipe.delete(f"sess:{token}")
+        pipe.srem(f"user:sessions:{user_id}", token)
+        pipe.zrem("sessions:expiry", token)
+        pipe.execute()
+    else:
+        user_sessions.get(user_id, set()).discard(token)
+        sessions_store.delete(token)
+
+def delete_user_sessions(user_id: str):
+    """Remove every session belonging to a user"""
+    if redis_client:
+        tokens = redis_client.smembers(f"user:sessions:{user_id}")
+        pipe = redis_client.pipeline()
+        for token in tokens:
+            pipe.delete(f"sess:{token}")
+        if tokens:
+            pipe.zrem("sessions:expiry", *tokens)
+        pipe.delete(f"user:sessions:{user_id}")
+        pipe.execute()
+    else:
+        for token in user_sessions.pop(user_id, set()):
+            sessions_store.delete(token)
+
+def save_payment(payment: dict):
+    """Persist a payment record"""
+    if redis_client:
+        pipe = redis_client.pipeline()
+        pipe.hset(f"payment:{payment['payment_id']}", mapping=payment)
+        pipe.sadd("payments", payment["payment_id"])
+        pipe.execute()
+    else:
+        payments_store.put(payment["payment_id"], payment)
+
+def storage_counts() -> dict:
+    """Record counts for /health (from Redis when it is the backend)"""
+    if redis_client:
+        pipe = redis_client.pipeline()
+        pipe.scard("users")
+        pipe.zcount("sessions:expiry", time.time(), "+inf")
+        pipe.scard("docs")
+        pipe.scard("payments")
+        user_count, session_count, document_count, payment_count = pipe.execute()
+    else:
+        user_count, session_count = len(users), len(sessions)
+        document_count, payment_count = len(documents), len(payments)
+    return {
+        "users": user_count,
+        "sessions": session_count,
+        "documents": document_count,
+        "payments": payment_count
+    }
+
+async def run_store(fn, *args, **kwargs):
+    """
+    Call a storage helper from an async handler. With Redis every helper is a
+    network round trip, so it runs in a worker thread instead of stalling
+    the event loop; the JSON backend is in-memory and is called inline.
+    """
+    if redis_client:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    return fn(*args, **kwargs)
+
+async def run_document_store(doc_ids, fn, *args, **kwargs):
+    """
+    run_store for helpers that read the given document records. JSON
+    records evicted from the LRU are loaded from disk, so a miss also runs
+    in a worker thread; cache hits stay inline.
+    """
+    if documents.cached(doc_ids):
+        return fn(*args, **kwargs)
+    return await asyncio.to_thread(fn, *args, **kwargs)
 
 # Subscription tiers
 SUBSCRIPTION_TIERS = {
@@ -250,12 +1160,32 @@ SUBSCRIPTION_TIERS = {
     "professional": {"name": "Professional", "limit": 20, "price": 20},
     "enterprise": {"name": "Enterprise", "limit": float('inf'), "price": 999}
 }
+TIER_LIMITS = {tier: info["limit"] for tier, info in SUBSCRIPTION_TIERS.items()}
+# Limits as reported to clients - JSON has no infinity, so unlimited is None
+TIER_RESPONSE_LIMITS = {
+    tier: None if limit == float('inf') else limit
+    for tier, limit in TIER_LIMITS.items()
+}
+
+# Purchasable tiers with their payment details, built once at startup
+PAYMENT_CALLBACK_PREFIX = f"{FRONTEND_URL}?payment_callback=true&user_id="
+TIER_PAYMENT_OFFERS = {
+    tier: {
+        "payment_url": PAYSTACK_PAYMENT_LINKS[tier],
+        "amount": info["price"],
+        "callback_suffix": f"&tier={tier}"
+    }
+    for tier, info in SUBSCRIPTION_TIERS.items()
+    if info["price"] > 0 and tier in PAYSTACK_PAYMENT_LINKS
+}
 
 # Supported formats
 SUPPORTED_FORMATS = {
     '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
     '.pdf': 'application/pdf'
 }
+SUPPORTED_FORMATS_TEXT = ', '.join(SUPPORTED_FORMATS)  # For error messages
+SUPPORTED_SUFFIXES = tuple(SUPPORTED_FORMATS)  # For str.endswith
 
 # ============================================
 # PYDANTIC MODELS
@@ -284,7 +1214,7 @@ class UserResponse(BaseModel):
     name: str
     tier: str
     translations_used: int
-    translations_limit: int
+    translations_limit: Optional[int] = None  # None means unlimited
     created_at: str
 
 class AuthResponse(BaseModel):
@@ -314,60 +1244,215 @@ class TaskStatus(BaseModel):
 # UTILITY FUNCTIONS
 # ============================================
 
+SCRYPT_PARAMS = {"n": 2 ** 14, "r": 8, "p": 1}  # Fallback KDF cost (16 MiB)
+
 def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode()).hexdigest()
+    if ARGON2_SUPPORT:
+        return password_hasher.hash(password)
+    salt = os.urandom(16)
+    digest = hashlib.scrypt(password.encode(), salt=salt, **SCRYPT_PARAMS)
+    return f"$scrypt${salt.hex()}${digest.hex()}"
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    """Check a password against an argon2, scrypt or legacy SHA-256 hash"""
+    if hashed_password.startswith("$argon2"):
+        if not ARGON2_SUPPORT:
+            return False
+        try:
+            return password_hasher.verify(hashed_password, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    if hashed_password.startswith("$scrypt$"):
+        try:
+            _, _, salt_hex, digest_hex = hashed_password.split("$")
+            salt, expected = bytes.fromhex(salt_hex), bytes.fromhex(digest_hex)
+        except ValueError:
+            return False
+        digest = hashlib.scrypt(password.encode(), salt=salt, **SCRYPT_PARAMS)
+        return hmac.compare_digest(digest, expected)
+    # Compare as bytes: compare_digest rejects str with non-ASCII characters
+    digest = hashlib.sha256(password.encode()).hexdigest().encode()
+    return hmac.compare_digest(digest, hashed_password.encode())
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True for hashes weaker than the current scheme or with outdated parameters"""
+    if not ARGON2_SUPPORT:
+        # Only unsalted legacy SHA-256 hashes are upgraded to scrypt
+        return not hashed_password.startswith("$")
+    if not hashed_password.startswith("$argon2"):
+        return True
+    return password_hasher.check_needs_rehash(hashed_password)
+
+def new_id() -> str:
+    """Random ID for users, documents, tasks and payments (32 hex chars, not a secret)"""
+    return uuid.uuid4().hex
 
 def generate_token() -> str:
-    return str(uuid.uuid4())
-
-def get_file_extension(filename: str) -> str:
-    return os.path.splitext(filename)[1].lower()
-
-def is_supported_format(filename: str) -> bool:
-    return get_file_extension(filename) in SUPPORTED_FORMATS
+    # 256 random bits, URL-safe base64 (existing UUID tokens stay valid)
+    return secrets.token_urlsafe(32)
+
+def get_supported_extension(filename: str) -> Optional[str]:
+    """Lower-cased extension of a supported file, or None if unsupported"""
+    filename = filename.lower()
+    if not filename.endswith(SUPPORTED_SUFFIXES):
+        return None
+    return filename[filename.rfind('.'):]
+
+def get_file_signature(path: str) -> Optional[list]:
+    """[mtime_ns, size] of a file, used to detect unchanged sources; None if missing"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+async def remove_file_if_exists(*paths: str):
+    """Delete files without blocking the event loop, concurrently"""
+    # Just try the remove - a missing file raises FileNotFoundError, which
+    # is ignored, and that saves an exists() thread hop per file
+    results = await asyncio.gather(*(aiofiles.os.remove(path) for path in paths), return_exceptions=True)
+    for path, result in zip(paths, results):
+        if isinstance(result, Exception) and not isinstance(result, FileNotFoundError):
+            logger.warning("Could not remove %s: %s", path, result)
+
+# Copy buffers shared across uploads, so concurrent uploads don't each
+# allocate (and page-fault in) a fresh 1 MiB buffer
+upload_buffers = SimpleQueue()
+
+def acquire_upload_buffer() -> bytearray:
+    try:
+        return upload_buffers.get_nowait()
+    except Empty:
+        return bytearray(CHUNK_SIZE_KB * 1024)
+
+def release_upload_buffer(chunk: bytearray):
+    if upload_buffers.qsize() < UPLOAD_BUFFER_POOL_SIZE:
+        upload_buffers.put(chunk)
+
+def copy_upload(src, dest_path: str, max_bytes: int, size_hint: Optional[int] = None) -> Optional[int]:
+    """Stream a spooled upload to disk in bounded chunks; None if over max_bytes"""
+    src.seek(0)
+    file_size = 0
+    chunk = acquire_upload_buffer()
+    try:
+        with memoryview(chunk) as view, open(dest_path, "wb") as buffer:
+            # Reserve the blocks up front (Linux) so the filesystem allocates
+            # one contiguous extent instead of growing the file chunk by chunk
+            if size_hint and hasattr(os, "posix_fallocate"):
+                try:
+                    os.posix_fallocate(buffer.fileno(), 0, size_hint)
+                except OSError:
+                    pass  # Not supported by this filesystem
+            while read := src.readinto(chunk):
+                file_size += read
+                if file_size > max_bytes:
+                    return None
+                buffer.write(view[:read])
+            buffer.truncate()  # Drop any reserved space the upload didn't fill
+    finally:
+        release_upload_buffer(chunk)
+    return file_size
 
 def get_payment_link(tier: str) -> str:
     """Get the correct Paystack payment link for a tier"""
     return PAYSTACK_PAYMENT_LINKS.get(tier, PAYSTACK_PAYMENT_LINKS["professional"])
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
-    """Verify authentication token"""
-    token = credentials.credentials
-    
-    if token not in sessions:
-        raise HTTPException(
-            status_code=401, 
-            detail="Invalid or expired token. Please sign in again."
-        )
-    
-    session = sessions[token]
-    user_id = session["user_id"]
+def check_token(token: str) -> dict:
+    """Resolve a session token to its user, raising 401 if it isn't valid"""
+    if redis_client:
+        # Expiry is handled by the key TTL. Every request checks Redis, so
+        # a sign-out on any worker takes effect immediately
+        user_id = redis_client.get(f"sess:{token}")
+        if user_id is None:
+            raise HTTPException(
+                status_code=401, 
+                detail="Invalid or expired token. Please sign in again."
+            )
+    else:
+        session = sessions.get(token)
+        if session is None:
+            raise HTTPException(
+                status_code=401, 
+                detail="Invalid or expired token. Please sign in again."
+            )
+        
+        user_id = session["user_id"]
+        
+        # Check expiration (created_at is epoch seconds - nothing to parse)
+        if time.time() - session["created_at"] > SESSION_TTL_SECONDS:
+            delete_session(token, user_id)
+            raise HTTPException(
+                status_code=401, 
+                detail="Session expired. Please sign in again."
+            )
     
-    # Check expiration
-    session_time = datetime.fromisoformat(session["created_at"])
-    age = datetime.now() - session_time
+    user = get_user(user_id)
     
-    if age > timedelta(days=1):
-        del sessions[token]
-        save_json(SESSIONS_FILE, sessions)
-        raise HTTPException(
-            status_code=401, 
-            detail="Session expired. Please sign in again."
-        )
-    
-    if user_id not in users:
+    if user is None:
         raise HTTPException(status_code=401, detail="User not found")
     
-    user = users[user_id]
-    
     return user
 
+async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    """
+    Verify authentication token. An async dependency, so JSON-mode checks
+    (pure dict lookups) skip the threadpool hop FastAPI gives sync ones;
+    Redis lookups still run in a worker thread via run_store
+    """
+    return await run_store(check_token, credentials.credentials)
+
 def get_user_by_email(email: str) -> Optional[dict]:
     """Find user by email"""
-    for user in users.values():
-        if user["email"].lower() == email.lower():
-            return user
-    return None
+    key = email.lower()
+    if redis_client:
+        user_id = redis_client.get(f"user:email:{key}")
+    else:
+        user_id = email_index.get(key)
+    return get_user(user_id) if user_id else None
+
+class DownloadFileResponse(FileResponse):
+    """
+    FileResponse that reads in CHUNK_SIZE_KB chunks (one thread hop per
+    chunk instead of one per 64 KiB). Servers offering the
+    http.response.pathsend extension send the file with no copies at all.
+    """
+    chunk_size = CHUNK_SIZE_KB * 1024
+
+def set_download_info(doc: dict):
+    """Store the download filename and media type on a translated document"""
+    original_name = os.path.splitext(doc["filename"])[0]
+    doc["download_filename"] = f"{original_name}_translated{doc['file_type']}"
+    doc["media_type"] = SUPPORTED_FORMATS.get(doc["file_type"], 'application/octet-stream')
+
+def user_response(user: dict) -> UserResponse:
+    """UserResponse for a stored user record (our own data, so not re-validated)"""
+    return UserResponse.model_construct(
+        user_id=user["user_id"],
+        email=user["email"],
+        name=user["name"],
+        tier=user["tier"],
+        translations_used=user["translations_used"],
+        translations_limit=TIER_RESPONSE_LIMITS[user["tier"]],
+        created_at=user["created_at"]
+    )
+
+def get_owned_document(doc_id: str, user: dict) -> dict:
+    """Get a document record, raising 404/403 unless it belongs to the user"""
+    doc = documents.get(doc_id)
+    if doc is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    if doc["user_id"] != user["user_id"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return doc
+
+def get_owned_task(task_id: str, user: dict) -> dict:
+    """Get a task, raising 404/403 unless it belongs to the user"""
+    task = task_manager.get_task(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if task["user_id"] != user["user_id"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return task
 
 # ============================================
 # BACKGROUND TRANSLATION FUNCTION
@@ -378,27 +1463,23 @@ def process_translation_task(task_id: str, doc: dict, source_lang: str, target_l
     Process translation in background thread
     """
     try:
-        print(f"\n{'='*70}")
-        print(f"🔄 BACKGROUND TRANSLATION STARTED")
-        print(f"{'='*70}")
-        print(f"Task ID: {task_id}")
-        print(f"Document: {doc['filename']}")
-        print(f"Size: {doc.get('file_size', 0) / (1024*1024):.2f} MB")
-        print(f"{'='*70}\n")
+        logger.info("Background translation started: task=%s document=%s size=%.2fMB",
+                    task_id, doc["filename"], doc.get("file_size", 0) / (1024*1024))
         
-        # Update task status
-        task_manager.update_task(task_id, 
-            status="processing",
-            started_at=datetime.now().isoformat(),
+        # Start only if the task wasn't cancelled while it was queued
+        if not task_manager.transition(task_id, ("queued",), "processing",
+            started_at=now_iso(),
             message="Initializing translation..."
-        )
+        ):
+            raise TranslationAborted("Translation cancelled by user")
         
-        # Check file exists
-        if not os.path.exists(doc["upload_path"]):
+        # Check file exists (the signature stat doubles as the check)
+        source_signature = get_file_signature(doc["upload_path"])
+        if source_signature is None:
             raise Exception("Source file not found")
         
         # Create output path
-        translated_doc_id = str(uuid.uuid4())
+        translated_doc_id = new_id()
         file_ext = doc["file_type"]
         output_path = os.path.join(OUTPUT_DIR, f"{translated_doc_id}{file_ext}")
         
@@ -408,38 +1489,29 @@ def process_translation_task(task_id: str, doc: dict, source_lang: str, target_l
             message="Loading document..."
         )
         
-        translator = DocumentTranslator(
-            source_lang=source_lang,
-            target_lang=target_lang
-        )
+        translator = translator_pool.acquire(source_lang, target_lang)
         
-        # Create a progress monitor
-        def update_progress():
-            """Monitor translation progress"""
-            start_time = time.time()
-            while True:
-                elapsed = time.time() - start_time
-                if elapsed > TRANSLATION_TIMEOUT:
-                    raise Exception("Translation timeout")
-                
-                # Calculate progress based on translator's cache
-                if hasattr(translator, 'translated_segments') and hasattr(translator, 'total_segments'):
-                    if translator.total_segments > 0:
-                        progress = int((translator.translated_segments / translator.total_segments) * 80) + 10
-                        task_manager.update_task(task_id, 
-                            progress=min(progress, 90),
-                            message=f"Translating... ({translator.translated_segments}/{translator.total_segments} segments)"
-                        )
-                
-                time.sleep(2)  # Update every 2 seconds
-                
-                # Check if translation is complete
-                if os.path.exists(output_path):
-                    break
+        # The translator reports progress as it goes - no polling thread.
+        # Worker threads can't be killed, so the timeout and user
+        # cancellation are enforced here, at each progress checkpoint.
+        deadline = time.monotonic() + TRANSLATION_TIMEOUT
+        unit = "pages" if doc["file_type"] == ".pdf" else "segments"
+        
+        def report_progress(done, total):
+            task = task_manager.get_task(task_id)
+            if task is None or task["status"] == "cancelled":
+                raise TranslationAborted("Translation cancelled by user")
+            if time.monotonic() > deadline:
+                raise TranslationAborted(f"Translation timed out after {TRANSLATION_TIMEOUT}s")
+            if total > 0:
+                # 20-90% is the translation itself; never move backwards
+                progress = min(20 + int(done / total * 70), 90)
+                task_manager.update_task(task_id,
+                    progress=max(task["progress"], progress),
+                    message=f"Translating... ({done}/{total} {unit})"
+                )
         
-        # Start progress monitor in separate thread
-        progress_thread = threading.Thread(target=update_progress, daemon=True)
-        progress_thread.start()
+        translator.progress_callback = report_progress
         
         # Perform translation
         task_manager.update_task(task_id, 
@@ -447,13 +1519,36 @@ def process_translation_task(task_id: str, doc: dict, source_lang: str, target_l
             message="Starting translation..."
         )
         
-        translator.translate_document(doc["upload_path"], output_path)
+        try:
+            translator.translate_document(doc["upload_path"], output_path)
+        finally:
+            translator.progress_callback = None
         
         # Verify output
         if not os.path.exists(output_path):
             raise Exception("Translation completed but output file not found")
         
         output_size = os.path.getsize(output_path)
+        segments_translated = len(translator.document_segments)
+        translator_pool.release(translator)
+        
+        # A cancel may land after the last progress checkpoint - completing
+        # is a compare-and-set, and only a completed task is charged
+        if not task_manager.transition(task_id, ("processing",), "completed",
+            progress=100,
+            message="Translation completed successfully!",
+            completed_at=now_iso(),
+            result={
+                "translated_doc_id": translated_doc_id,
+                "output_size": output_size,
+                "segments_translated": segments_translated
+            }
+        ):
+            try:
+                os.remove(output_path)
+            except OSError:
+                pass
+            raise TranslationAborted("Translation cancelled by user")
         
         # Update document record
         doc["status"] = "completed"
@@ -461,57 +1556,39 @@ def process_translation_task(task_id: str, doc: dict, source_lang: str, target_l
         doc["translated_doc_id"] = translated_doc_id
         doc["source_lang"] = source_lang
         doc["target_lang"] = target_lang
-        doc["translation_time"] = datetime.now().isoformat()
+        doc["translation_time"] = now_iso()
         doc["output_size"] = output_size
+        doc["segments_translated"] = segments_translated
+        doc["source_signature"] = source_signature
+        set_download_info(doc)
+        documents.save(doc)
         
         # Update user usage
-        if user_id in users:
-            users[user_id]["translations_used"] += 1
-            users[user_id]["updated_at"] = datetime.now().isoformat()
-            save_json(USERS_FILE, users)
+        increment_translations_used(user_id)
         
-        # Update task as completed
-        task_manager.update_task(task_id,
-            status="completed",
-            progress=100,
-            message="Translation completed successfully!",
-            completed_at=datetime.now().isoformat(),
-            result={
-                "translated_doc_id": translated_doc_id,
-                "output_size": output_size,
-                "segments_translated": len(translator.translation_cache)
-            }
-        )
-        
-        print(f"\n{'='*70}")
-        print(f"✅ BACKGROUND TRANSLATION COMPLETED")
-        print(f"{'='*70}")
-        print(f"Task ID: {task_id}")
-        print(f"Output size: {output_size / (1024*1024):.2f} MB")
-        print(f"Segments: {len(translator.translation_cache)}")
-        print(f"{'='*70}\n")
+        logger.info("Background translation completed: task=%s output=%.2fMB segments=%s",
+                    task_id, output_size / (1024*1024), segments_translated)
         
     except Exception as e:
         error_msg = str(e)
-        print(f"\n{'='*70}")
-        print(f"❌ BACKGROUND TRANSLATION FAILED")
-        print(f"{'='*70}")
-        print(f"Task ID: {task_id}")
-        print(f"Error: {error_msg}")
-        print(f"{'='*70}\n")
+        task = task_manager.get_task(task_id)
+        if task is not None and task["status"] == "cancelled":
+            logger.info("Background translation cancelled: task=%s", task_id)
+        else:
+            logger.error("Background translation failed: task=%s error=%s", task_id, error_msg)
         
         # Update document status
         doc["status"] = "failed"
         doc["error"] = error_msg
-        doc["error_time"] = datetime.now().isoformat()
+        doc["error_time"] = now_iso()
+        documents.save(doc)
         
-        # Update task as failed
-        task_manager.update_task(task_id,
-            status="failed",
+        # Update task as failed (a cancelled task keeps its "cancelled" status)
+        task_manager.transition(task_id, ("queued", "processing"), "failed",
             progress=0,
             message="Translation failed",
             error=error_msg,
-            completed_at=datetime.now().isoformat()
+            completed_at=now_iso()
         )
 
 # ============================================
@@ -523,123 +1600,74 @@ async def sign_up(user_data: UserSignUp):
     """Register a new user"""
     
     # Check if user exists
-    if any(u["email"] == user_data.email for u in users.values()):
+    if await run_store(get_user_by_email, user_data.email):
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Create user
-    user_id = str(uuid.uuid4())
-    hashed_password = hash_password(user_data.password)
+    user_id = new_id()
+    # Hash off the event loop - argon2 is deliberately slow
+    hashed_password = await asyncio.to_thread(hash_password, user_data.password)
+    
+    # Another signup may have taken the email while we were hashing
+    if not await run_store(claim_email, user_data.email, user_id):
+        raise HTTPException(status_code=400, detail="Email already registered")
     
-    users[user_id] = {
+    now = now_iso()
+    user = {
         "user_id": user_id,
         "email": user_data.email,
         "name": user_data.name,
         "password": hashed_password,
         "tier": "free",
         "translations_used": 0,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
+        "created_at": now,
+        "updated_at": now
     }
     
-    save_json(USERS_FILE, users)
+    await run_store(save_user, user)
     
     # Create session
-    token = generate_token()
-    sessions[token] = {
-        "user_id": user_id,
-        "created_at": datetime.now().isoformat()
-    }
-    save_json(SESSIONS_FILE, sessions)
-    
-    user = users[user_id]
-    tier_info = SUBSCRIPTION_TIERS[user["tier"]]
-    
-    return AuthResponse(
-        token=token,
-        user=UserResponse(
-            user_id=user["user_id"],
-            email=user["email"],
-            name=user["name"],
-            tier=user["tier"],
-            translations_used=user["translations_used"],
-            translations_limit=tier_info["limit"],
-            created_at=user["created_at"]
-        )
-    )
+    token = await run_store(create_session, user_id)
+    
+    return AuthResponse.model_construct(token=token, user=user_response(user))
 
 @app.post("/auth/signin", response_model=AuthResponse)
 async def sign_in(credentials: UserSignIn):
     """Sign in existing user"""
     
     # Find user
-    user = None
-    for u in users.values():
-        if u["email"] == credentials.email:
-            user = u
-            break
+    user = await run_store(get_user_by_email, credentials.email)
     
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
-    # Verify password
-    hashed_password = hash_password(credentials.password)
-    if user["password"] != hashed_password:
+    # Verify password off the event loop
+    if not await asyncio.to_thread(verify_password, credentials.password, user["password"]):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
+    # Upgrade legacy hashes now that we have the plaintext
+    if password_needs_rehash(user["password"]):
+        new_hash = await asyncio.to_thread(hash_password, credentials.password)
+        user = await run_store(update_user, user["user_id"], password=new_hash) or user
+    
     # Create session
-    token = generate_token()
-    sessions[token] = {
-        "user_id": user["user_id"],
-        "created_at": datetime.now().isoformat()
-    }
-    save_json(SESSIONS_FILE, sessions)
-    
-    tier_info = SUBSCRIPTION_TIERS[user["tier"]]
-    
-    return AuthResponse(
-        token=token,
-        user=UserResponse(
-            user_id=user["user_id"],
-            email=user["email"],
-            name=user["name"],
-            tier=user["tier"],
-            translations_used=user["translations_used"],
-            translations_limit=tier_info["limit"],
-            created_at=user["created_at"]
-        )
-    )
+    token = await run_store(create_session, user["user_id"])
+    
+    return AuthResponse.model_construct(token=token, user=user_response(user))
 
 @app.post("/auth/signout")
 async def sign_out(user: dict = Depends(verify_token)):
     """Sign out current user"""
     
-    # Remove session
-    token_to_remove = None
-    for token, session in sessions.items():
-        if session["user_id"] == user["user_id"]:
-            token_to_remove = token
-            break
-    
-    if token_to_remove:
-        del sessions[token_to_remove]
-        save_json(SESSIONS_FILE, sessions)
+    # Remove all of the user's sessions
+    await run_store(delete_user_sessions, user["user_id"])
     
     return {"message": "Signed out successfully"}
 
 @app.get("/auth/me", response_model=UserResponse)
 async def get_current_user(user: dict = Depends(verify_token)):
     """Get current user info"""
-    tier_info = SUBSCRIPTION_TIERS[user["tier"]]
-    
-    return UserResponse(
-        user_id=user["user_id"],
-        email=user["email"],
-        name=user["name"],
-        tier=user["tier"],
-        translations_used=user["translations_used"],
-        translations_limit=tier_info["limit"],
-        created_at=user["created_at"]
-    )
+    return user_response(user)
 
 # ============================================
 # DOCUMENT TRANSLATION ENDPOINTS - ENHANCED
@@ -653,83 +1681,70 @@ async def upload_document(
 ):
     """Upload document with size validation and chunked reading"""
     
-    print(f"\n{'='*70}")
-    print(f"📤 FILE UPLOAD")
-    print(f"{'='*70}")
-    print(f"User:     {user['email']}")
-    print(f"Filename: {file.filename}")
-    print(f"{'='*70}\n")
+    logger.info("Upload: user=%s filename=%s", user["email"], file.filename)
     
     # Check limit
-    tier_info = SUBSCRIPTION_TIERS[user["tier"]]
-    if user["translations_used"] >= tier_info["limit"]:
+    limit = TIER_LIMITS[user["tier"]]
+    if user["translations_used"] >= limit:
         raise HTTPException(
             status_code=403,
-            detail=f"Translation limit reached ({tier_info['limit']} per month)"
+            detail=f"Translation limit reached ({limit} per month)"
         )
     
-    # Validate format
-    if not is_supported_format(file.filename):
+    # Validate format (extension parsed once and reused for the upload path)
+    file_ext = get_supported_extension(file.filename or "")
+    if file_ext is None:
         raise HTTPException(
             status_code=400,
-            detail=f"Unsupported format. Supported: {', '.join(SUPPORTED_FORMATS.keys())}"
+            detail=f"Unsupported format. Supported: {SUPPORTED_FORMATS_TEXT}"
         )
     
     # Save file with chunked reading for large files
-    doc_id = str(uuid.uuid4())
-    file_ext = get_file_extension(file.filename)
+    doc_id = new_id()
     upload_path = os.path.join(UPLOAD_DIR, f"{doc_id}{file_ext}")
     
     try:
-        file_size = 0
-        chunk_count = 0
+        max_bytes = MAX_FILE_SIZE_MB * 1024 * 1024
         
-        with open(upload_path, "wb") as buffer:
-            while True:
-                # Read in chunks to handle large files
-                chunk = await file.read(CHUNK_SIZE_KB * 1024)
-                if not chunk:
-                    break
-                    
-                buffer.write(chunk)
-                file_size += len(chunk)
-                chunk_count += 1
-                
-                # Check size limit
-                if file_size > MAX_FILE_SIZE_MB * 1024 * 1024:
-                    os.remove(upload_path)
-                    raise HTTPException(
-                        status_code=413,
-                        detail=f"File too large. Maximum size is {MAX_FILE_SIZE_MB}MB"
-                    )
-                
-                # Log progress for very large files
-                if chunk_count % 10 == 0:
-                    print(f"  Uploaded {file_size / (1024*1024):.1f}MB...")
+        # The multipart parser has already spooled the body, so reject
+        # oversized files before copying a single byte
+        if file.size is not None and file.size > max_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. Maximum size is {MAX_FILE_SIZE_MB}MB"
+            )
+        
+        # Copy in fixed-size chunks inside one worker thread instead of
+        # two thread hops (read + write) per chunk
+        file_size = await asyncio.to_thread(copy_upload, file.file, upload_path, max_bytes, file.size)
+        if file_size is None:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. Maximum size is {MAX_FILE_SIZE_MB}MB"
+            )
         
-        print(f"✓ File saved: {upload_path}")
-        print(f"✓ Size: {file_size / (1024*1024):.2f}MB")
-        print(f"✓ Doc ID: {doc_id}\n")
+        logger.info("File saved: doc=%s path=%s size=%.2fMB", doc_id, upload_path, file_size / (1024*1024))
         
     except HTTPException:
+        await remove_file_if_exists(upload_path)
         raise
     except Exception as e:
-        if os.path.exists(upload_path):
-            os.remove(upload_path)
-        print(f"❌ Save failed: {e}\n")
+        await remove_file_if_exists(upload_path)
+        logger.error("Save failed for %s: %s", file.filename, e)
         raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
     
     # Store metadata
-    documents[doc_id] = {
+    await documents.asave({
         "doc_id": doc_id,
         "user_id": user["user_id"],
         "filename": file.filename,
         "file_type": file_ext,
         "upload_path": upload_path,
-        "upload_time": datetime.now().isoformat(),
+        "upload_time": datetime.now().isoformat(),  # Full precision - orders the document index
         "status": "uploaded",
         "file_size": file_size
-    }
+    })
+    await run_store(add_user_document, user["user_id"], doc_id)
     
     # Determine if file is large
     is_large_file = file_size > 5 * 1024 * 1024  # > 5MB
@@ -754,14 +1769,8 @@ async def translate_document(
 ):
     """Translate document with background processing for large files"""
     
-    print(f"\n{'='*70}")
-    print(f"🌐 TRANSLATION REQUEST")
-    print(f"{'='*70}")
-    print(f"User:    {user['email']}")
-    print(f"Doc ID:  {request.doc_id}")
-    print(f"Source:  {request.source_lang}")
-    print(f"Target:  {request.target_lang}")
-    print(f"{'='*70}\n")
+    logger.info("Translation request: user=%s doc=%s %s -> %s",
+                user["email"], request.doc_id, request.source_lang, request.target_lang)
     
     # Check translator availability
     if not TRANSLATOR_AVAILABLE:
@@ -770,55 +1779,91 @@ async def translate_document(
             detail="Translation service not available. Contact administrator."
         )
     
-    # Check document exists
-    if request.doc_id not in documents:
-        raise HTTPException(status_code=404, detail="Document not found")
-    
-    doc = documents[request.doc_id]
-    
-    # Verify ownership
-    if doc["user_id"] != user["user_id"]:
-        raise HTTPException(status_code=403, detail="Not authorized")
+    # Check document exists and belongs to the user
+    doc = await run_document_store([request.doc_id], get_owned_document, request.doc_id, user)
     
     # Check limit
-    tier_info = SUBSCRIPTION_TIERS[user["tier"]]
-    if user["translations_used"] >= tier_info["limit"]:
+    limit = TIER_LIMITS[user["tier"]]
+    if user["translations_used"] >= limit:
         raise HTTPException(status_code=403, detail="Translation limit reached")
     
+    # Stat the source (which doubles as the existence check) and look for a
+    # previous output concurrently - the two checks are independent
+    source_signature, output_exists = await asyncio.gather(
+        asyncio.to_thread(get_file_signature, doc["upload_path"]),
+        aiofiles.os.path.exists(doc.get("translated_path") or "")
+    )
+    
     # Check file exists
-    if not os.path.exists(doc["upload_path"]):
+    if source_signature is None:
         doc["status"] = "failed"
         doc["error"] = "Source file not found"
+        await documents.asave(doc)
         raise HTTPException(status_code=404, detail="Source file not found")
     
+    # Reuse the existing output when the unchanged source is re-translated
+    # to the same language pair instead of parsing it again
+    if (doc["status"] == "completed"
+            and doc.get("source_signature") == source_signature
+            and doc.get("source_lang") == request.source_lang
+            and doc.get("target_lang") == request.target_lang
+            and output_exists):
+        updated_user = await run_store(increment_translations_used, user["user_id"])
+        
+        logger.info("Reusing existing translation for unchanged source: doc=%s", request.doc_id)
+        
+        return {
+            "doc_id": request.doc_id,
+            "status": "completed",
+            "translated_doc_id": doc["translated_doc_id"],
+            "file_type": doc["file_type"],
+            "translation_time": 0.0,
+            "segments_translated": doc.get("segments_translated", 0),
+            "translations_remaining": limit - updated_user["translations_used"]
+        }
+    
     # Determine if this should be a background task
     file_size_mb = doc["file_size"] / (1024 * 1024)
     use_background = file_size_mb > 2  # Use background for files > 2MB
     
     if use_background:
-        # Create background task
-        task_id = str(uuid.uuid4())
-        
-        # Add to task manager
-        task_manager.add_task(task_id, user["user_id"], doc)
+        # Apply backpressure instead of queueing unbounded work
+        if not task_manager.acquire_slot():
+            raise HTTPException(
+                status_code=503,
+                detail="Translation queue is full. Please try again in a few minutes."
+            )
         
-        # Update document with task ID
-        doc["task_id"] = task_id
-        doc["status"] = "queued"
+        # Create background task
+        task_id = new_id()
         
-        # Submit to thread pool
-        task_manager.executor.submit(
-            process_translation_task,
-            task_id,
-            doc,
-            request.source_lang,
-            request.target_lang,
-            user["user_id"]
-        )
+        try:
+            # Add to task manager
+            task_manager.add_task(task_id, user["user_id"], doc)
+            
+            # Update document with task ID
+            doc["task_id"] = task_id
+            doc["status"] = "queued"
+            await documents.asave(doc)
+            
+            # Submit to thread pool
+            task_manager.submit(
+                process_translation_task,
+                task_id,
+                doc,
+                request.source_lang,
+                request.target_lang,
+                user["user_id"]
+            )
+        except BaseException:
+            # Nothing was queued, so the reserved slot is ours to give back
+            task_manager.release_slot()
+            task_manager.transition(task_id, ("queued",), "failed",
+                                    error="Could not queue translation", completed_at=now_iso())
+            raise
         
-        print(f"✓ Background task created: {task_id}")
-        print(f"  File size: {file_size_mb:.2f}MB")
-        print(f"  Estimated time: {int(file_size_mb * 2)} minutes\n")
+        logger.info("Background task created: task=%s size=%.2fMB estimate=%s min",
+                    task_id, file_size_mb, int(file_size_mb * 2))
         
         return {
             "doc_id": request.doc_id,
@@ -832,48 +1877,49 @@ async def translate_document(
     else:
         # Process small files immediately (existing code)
         try:
-            print(f"Processing small file directly ({file_size_mb:.2f}MB)...")
+            logger.info("Processing small file directly (%.2fMB)", file_size_mb)
             
             doc["status"] = "translating"
             
             # Create output path
-            translated_doc_id = str(uuid.uuid4())
+            translated_doc_id = new_id()
             file_ext = doc["file_type"]
             output_path = os.path.join(OUTPUT_DIR, f"{translated_doc_id}{file_ext}")
             
-            # Initialize translator
-            translator = DocumentTranslator(
-                source_lang=request.source_lang,
-                target_lang=request.target_lang
-            )
+            # Reuse a pooled translator for this language pair
+            translator = translator_pool.acquire(request.source_lang, request.target_lang)
             
-            # Translate with timeout
+            # Translate in a worker thread so the event loop keeps serving requests
             start_time = time.time()
-            translator.translate_document(doc["upload_path"], output_path)
+            await asyncio.to_thread(translator.translate_document, doc["upload_path"], output_path)
             translation_time = time.time() - start_time
             
             # Verify output
-            if not os.path.exists(output_path):
+            if not await aiofiles.os.path.exists(output_path):
                 raise Exception("Translation completed but output file not found")
             
-            output_size = os.path.getsize(output_path)
+            output_size = await aiofiles.os.path.getsize(output_path)
+            segments_translated = len(translator.document_segments)
+            translator_pool.release(translator)
             
             # Update document
+            doc["segments_translated"] = segments_translated
+            doc["source_signature"] = source_signature
             doc["status"] = "completed"
             doc["translated_path"] = output_path
             doc["translated_doc_id"] = translated_doc_id
             doc["source_lang"] = request.source_lang
             doc["target_lang"] = request.target_lang
-            doc["translation_time"] = datetime.now().isoformat()
+            doc["translation_time"] = now_iso()
             doc["translation_duration"] = translation_time
             doc["output_size"] = output_size
+            set_download_info(doc)
+            await documents.asave(doc)
             
             # Increment usage
-            users[user["user_id"]]["translations_used"] += 1
-            users[user["user_id"]]["updated_at"] = datetime.now().isoformat()
-            save_json(USERS_FILE, users)
+            updated_user = await run_store(increment_translations_used, user["user_id"])
             
-            print(f"✓ Direct translation completed in {translation_time:.1f}s\n")
+            logger.info("Direct translation completed in %.1fs: doc=%s", translation_time, request.doc_id)
             
             return {
                 "doc_id": request.doc_id,
@@ -881,17 +1927,18 @@ async def translate_document(
                 "translated_doc_id": translated_doc_id,
                 "file_type": file_ext,
                 "translation_time": translation_time,
-                "segments_translated": len(translator.translation_cache),
-                "translations_remaining": tier_info["limit"] - users[user["user_id"]]["translations_used"]
+                "segments_translated": segments_translated,
+                "translations_remaining": limit - updated_user["translations_used"]
             }
             
         except Exception as e:
             error_msg = str(e)
-            print(f"❌ Direct translation failed: {error_msg}\n")
+            logger.error("Direct translation failed: doc=%s error=%s", request.doc_id, error_msg)
             
             doc["status"] = "failed"
             doc["error"] = error_msg
-            doc["error_time"] = datetime.now().isoformat()
+            doc["error_time"] = now_iso()
+            await documents.asave(doc)
             
             raise HTTPException(
                 status_code=500,
@@ -902,16 +1949,11 @@ async def translate_document(
 async def get_task_status(task_id: str, user: dict = Depends(verify_token)):
     """Get status of background translation task"""
     
-    task = task_manager.get_task(task_id)
-    
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    
-    # Verify ownership
-    if task["user_id"] != user["user_id"]:
-        raise HTTPException(status_code=403, detail="Not authorized")
+    task = get_owned_task(task_id, user)
     
-    return TaskStatus(
+    # Polled constantly while a translation runs; the fields come from our
+    # own task records, so skip re-validation
+    return TaskStatus.model_construct(
         task_id=task["task_id"],
         status=task["status"],
         progress=task["progress"],
@@ -924,98 +1966,111 @@ async def get_task_status(task_id: str, user: dict = Depends(verify_token)):
 async def get_my_tasks(user: dict = Depends(verify_token)):
     """Get all tasks for current user"""
     
-    tasks = task_manager.get_user_tasks(user["user_id"])
-    
-    # Sort by creation time, newest first
-    tasks.sort(key=lambda x: x["created_at"], reverse=True)
-    
-    # Return only recent tasks
-    return tasks[:10]
+    # Return only recent tasks, newest first
+    return task_manager.get_recent_user_tasks(user["user_id"], limit=10)
 
 @app.post("/task/{task_id}/cancel")
 async def cancel_task(task_id: str, user: dict = Depends(verify_token)):
     """Cancel a running task"""
     
-    task = task_manager.get_task(task_id)
-    
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    
-    if task["user_id"] != user["user_id"]:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    if task["status"] in ["completed", "failed"]:
-        raise HTTPException(status_code=400, detail="Task already finished")
+    get_owned_task(task_id, user)  # 404/403 unless it's the user's task
     
-    task_manager.update_task(task_id,
-        status="cancelled",
+    # Checked and applied under the task lock, so a task finishing at the
+    # same moment is never flipped back to cancelled
+    if not task_manager.transition(task_id, ("queued", "processing"), "cancelled",
         message="Task cancelled by user",
-        completed_at=datetime.now().isoformat()
-    )
+        completed_at=now_iso()
+    ):
+        raise HTTPException(status_code=400, detail="Task already finished")
     
     return {"message": "Task cancelled"}
 
 @app.get("/download/{doc_id}")
-async def download_document(doc_id: str, user: dict = Depends(verify_token)):
+async def download_document(doc_id: str, request: Request, user: dict = Depends(verify_token)):
     """Download translated document"""
     
-    if doc_id not in documents:
-        raise HTTPException(status_code=404, detail="Document not found")
-    
-    doc = documents[doc_id]
+    doc = await run_document_store([doc_id], get_owned_document, doc_id, user)
     
-    if doc["user_id"] != user["user_id"]:
-        raise HTTPException(status_code=403, detail="Not authorized")
+    if not doc.get("translated_path"):
+        raise HTTPException(status_code=404, detail="Translated file not found")
     
-    if not doc.get("translated_path") or not os.path.exists(doc["translated_path"]):
+    # Stat once here and hand the result to FileResponse so it doesn't stat again
+    try:
+        stat_result = await aiofiles.os.stat(doc["translated_path"])
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Translated file not found")
     
-    original_name = os.path.splitext(doc["filename"])[0]
-    file_ext = doc["file_type"]
-    translated_filename = f"{original_name}_translated{file_ext}"
+    # Records saved before download info was stored get it filled in once
+    if "download_filename" not in doc:
+        set_download_info(doc)
     
-    return FileResponse(
+    response = DownloadFileResponse(
         path=doc["translated_path"],
-        filename=translated_filename,
-        media_type=SUPPORTED_FORMATS.get(file_ext, 'application/octet-stream')
+        filename=doc["download_filename"],
+        media_type=doc["media_type"],
+        stat_result=stat_result
     )
+    
+    # FileResponse sets ETag/Last-Modified but never answers conditional
+    # requests, so repeat downloads of an unchanged file get a bodiless 304
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if "*" in tags or response.headers["etag"] in tags:
+            return Response(status_code=304, headers={
+                "etag": response.headers["etag"],
+                "last-modified": response.headers["last-modified"]
+            })
+    
+    return response
 
 @app.get("/documents", response_model=List[DocumentInfo])
-async def list_documents(user: dict = Depends(verify_token)):
-    """List user documents with task info"""
-    
-    user_documents = []
-    
-    for doc in documents.values():
-        if doc["user_id"] == user["user_id"]:
-            # Add task progress if available
-            progress = None
-            if doc.get("task_id"):
-                task = task_manager.get_task(doc["task_id"])
-                if task:
-                    progress = task["progress"]
-                    # Update doc status from task
-                    if task["status"] == "completed":
-                        doc["status"] = "completed"
-                    elif task["status"] == "failed":
-                        doc["status"] = "failed"
-                        doc["error"] = task.get("error")
-            
-            user_documents.append(
-                DocumentInfo(
-                    doc_id=doc["doc_id"],
-                    filename=doc["filename"],
-                    file_type=doc["file_type"],
-                    status=doc["status"],
-                    upload_time=doc["upload_time"],
-                    translated_doc_id=doc.get("translated_doc_id"),
-                    error=doc.get("error"),
-                    task_id=doc.get("task_id"),
-                    progress=progress
-                )
+async def list_documents(
+    user: dict = Depends(verify_token),
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0)
+):
+    """List user documents with task info, newest first"""
+    
+    # The per-user index is in upload order, so newest first is just reversed -
+    # no sort needed, and only the requested page is built
+    doc_ids = (await run_store(get_user_document_ids, user["user_id"]))[::-1]
+    end = offset + limit if limit is not None else None
+    page_ids = doc_ids[offset:end]
+    page = await run_document_store(page_ids, documents.get_many, page_ids)
+    
+    user_document_list = []
+    
+    for doc in page:
+        # Add task progress if available
+        progress = None
+        if doc.get("task_id"):
+            task = task_manager.get_task(doc["task_id"])
+            if task:
+                progress = task["progress"]
+                # Update doc status from task
+                if task["status"] == "completed":
+                    doc["status"] = "completed"
+                elif task["status"] == "failed":
+                    doc["status"] = "failed"
+                    doc["error"] = task.get("error")
+        
+        # Fields come from our own records, so skip re-validation
+        user_document_list.append(
+            DocumentInfo.model_construct(
+                doc_id=doc["doc_id"],
+                filename=doc["filename"],
+                file_type=doc["file_type"],
+                status=doc["status"],
+                upload_time=doc["upload_time"],
+                translated_doc_id=doc.get("translated_doc_id"),
+                error=doc.get("error"),
+                task_id=doc.get("task_id"),
+                progress=progress
             )
+        )
     
-    return sorted(user_documents, key=lambda x: x.upload_time, reverse=True)
+    return user_document_list
 
 # ============================================
 # PAYMENT ENDPOINTS - UPDATED FOR MULTIPLE TIERS
@@ -1025,51 +2080,40 @@ async def list_documents(user: dict = Depends(verify_token)):
 async def initiate_payment(payment_request: PaymentInitiate, user: dict = Depends(verify_token)):
     """Initiate Paystack payment for Professional or Enterprise tier"""
     
-    if payment_request.tier not in SUBSCRIPTION_TIERS:
-        raise HTTPException(status_code=400, detail="Invalid subscription tier")
-    
-    tier = SUBSCRIPTION_TIERS[payment_request.tier]
-    
-    if tier["price"] == 0:
-        raise HTTPException(status_code=400, detail="Cannot purchase free tier")
+    offer = TIER_PAYMENT_OFFERS.get(payment_request.tier)
     
-    # Validate tier has a payment link
-    if payment_request.tier not in PAYSTACK_PAYMENT_LINKS:
+    if offer is None:
+        if payment_request.tier not in SUBSCRIPTION_TIERS:
+            raise HTTPException(status_code=400, detail="Invalid subscription tier")
+        if SUBSCRIPTION_TIERS[payment_request.tier]["price"] == 0:
+            raise HTTPException(status_code=400, detail="Cannot purchase free tier")
         raise HTTPException(status_code=400, detail=f"No payment link configured for {payment_request.tier} tier")
     
-    upgrade_id = str(uuid.uuid4())
+    upgrade_id = new_id()
     
     # Store pending upgrade info
-    pending_upgrades[user["user_id"]] = {
+    pending_upgrades_store.put(user["user_id"], {
         "upgrade_id": upgrade_id,
         "user_id": user["user_id"],
         "email": user["email"],
         "tier": payment_request.tier,
-        "amount": tier["price"],
+        "amount": offer["amount"],
         "status": "pending",
-        "created_at": datetime.now().isoformat()
-    }
-    save_json(PENDING_UPGRADES_FILE, pending_upgrades)
-    
-    # Get the correct payment link for the tier
-    payment_url = get_payment_link(payment_request.tier)
+        "created_at": now_iso()
+    })
     
-    callback_url = f"{FRONTEND_URL}?payment_callback=true&user_id={user['user_id']}&tier={payment_request.tier}"
+    payment_url = offer["payment_url"]
+    callback_url = f"{PAYMENT_CALLBACK_PREFIX}{user['user_id']}{offer['callback_suffix']}"
     
-    print(f"\n{'='*70}")
-    print(f"💳 PAYMENT INITIATED")
-    print(f"{'='*70}")
-    print(f"User:    {user['email']}")
-    print(f"Tier:    {payment_request.tier}")
-    print(f"Amount:  R{tier['price']}")
-    print(f"URL:     {payment_url}")
-    print(f"{'='*70}\n")
+    logger.info("Payment initiated: user=%s tier=%s amount=R%s",
+                user["email"], payment_request.tier, offer["amount"])
+    logger.debug("Payment URL for %s: %s", user["email"], payment_url)
     
     return {
         "payment_url": payment_url,
         "upgrade_id": upgrade_id,
         "tier": payment_request.tier,
-        "amount": tier["price"],
+        "amount": offer["amount"],
         "callback_url": callback_url
     }
 
@@ -1090,15 +2134,15 @@ async def verify_payment(user: dict = Depends(verify_token)):
         raise HTTPException(status_code=400, detail="Invalid tier in pending upgrade")
     
     # Update user tier
-    if user_id in users:
-        users[user_id]["tier"] = new_tier
-        users[user_id]["translations_used"] = 0  # Reset usage on upgrade
-        users[user_id]["updated_at"] = datetime.now().isoformat()
-        save_json(USERS_FILE, users)
+    updated_user = await run_store(update_user, user_id,
+        tier=new_tier,
+        translations_used=0,  # Reset usage on upgrade
+        updated_at=now_iso()
+    ) or user
     
     # Record payment
-    payment_id = str(uuid.uuid4())
-    payments[payment_id] = {
+    payment_id = new_id()
+    await run_store(save_payment, {
         "payment_id": payment_id,
         "user_id": user_id,
         "email": user["email"],
@@ -1106,23 +2150,16 @@ async def verify_payment(user: dict = Depends(verify_token)):
         "amount": pending["amount"],
         "status": "completed",
         "created_at": pending["created_at"],
-        "completed_at": datetime.now().isoformat()
-    }
-    save_json(PAYMENTS_FILE, payments)
+        "completed_at": now_iso()
+    })
     
     # Remove pending upgrade
-    del pending_upgrades[user_id]
-    save_json(PENDING_UPGRADES_FILE, pending_upgrades)
+    pending_upgrades_store.delete(user_id)
     
     tier_info = SUBSCRIPTION_TIERS[new_tier]
     
-    print(f"\n{'='*70}")
-    print(f"✅ PAYMENT VERIFIED - USER UPGRADED")
-    print(f"{'='*70}")
-    print(f"User:     {user['email']}")
-    print(f"New Tier: {new_tier}")
-    print(f"Limit:    {tier_info['limit']}")
-    print(f"{'='*70}\n")
+    logger.info("Payment verified: user=%s upgraded to %s (limit %s)",
+                user["email"], new_tier, tier_info["limit"])
     
     return {
         "status": "success",
@@ -1130,9 +2167,9 @@ async def verify_payment(user: dict = Depends(verify_token)):
         "tier": new_tier,
         "translations_limit": tier_info["limit"],
         "user": {
-            "user_id": users[user_id]["user_id"],
-            "email": users[user_id]["email"],
-            "name": users[user_id]["name"],
+            "user_id": updated_user["user_id"],
+            "email": updated_user["email"],
+            "name": updated_user["name"],
             "tier": new_tier,
             "translations_used": 0,
             "translations_limit": tier_info["limit"]
@@ -1146,72 +2183,112 @@ async def verify_payment(user: dict = Depends(verify_token)):
 @app.on_event("startup")
 async def startup_event():
     """Run cleanup tasks on startup"""
-    # Clean up old tasks periodically
+    # Clean up old tasks periodically. Expired tasks are a prefix of the
+    # creation-ordered task dict, so each pass only touches what it removes
     async def cleanup_loop():
         while True:
-            await asyncio.sleep(3600)  # Every hour
-            task_manager.cleanup_old_tasks(24)  # Remove tasks older than 24 hours
-            print("✓ Cleaned up old tasks")
+            await asyncio.sleep(TASK_CLEANUP_INTERVAL_SECONDS)
+            removed = task_manager.cleanup_old_tasks()
+            if removed:
+                logger.info("Cleaned up %d old tasks", removed)
     
     asyncio.create_task(cleanup_loop())
+    
+    # Persist changed JSON stores in the background. The flusher sleeps
+    # until something is marked dirty, then waits FLUSH_INTERVAL_SECONDS so
+    # a burst of updates is coalesced into one write per store
+    global flusher_loop
+    flusher_loop = asyncio.get_running_loop()
+    
+    async def flush_loop():
+        while True:
+            await dirty_event.wait()
+            await asyncio.sleep(FLUSH_INTERVAL_SECONDS)
+            dirty_event.clear()
+            await flush_dirty_files()
+            if dirty_files:
+                dirty_event.set()
+    
+    if dirty_files or any(store.pending for store in journaled_stores.values()):
+        dirty_event.set()
+    asyncio.create_task(flush_loop())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Write any pending JSON store changes before exiting"""
+    flush_dirty_files_sync()
 
 # ============================================
 # ROOT ENDPOINTS
 # ============================================
 
+# The API info never changes at runtime, so encode it once
+ROOT_INFO = {
+    "service": "Document Translation API - Enhanced for Large Files",
+    "version": "4.0.0",
+    "status": "operational",
+    "translator_available": TRANSLATOR_AVAILABLE,
+    "features": [
+        "Background processing for large files",
+        "Real-time progress tracking",
+        "File size validation (max 100MB)",
+        "Chunked file uploads",
+        "Task management and cancellation",
+        "Concurrent translation limits",
+        "Automatic retry with exponential backoff",
+        "Progress polling for long-running tasks",
+        "Multiple payment tiers (Professional & Enterprise)"
+    ],
+    "limits": {
+        "max_file_size_mb": MAX_FILE_SIZE_MB,
+        "max_concurrent_translations": MAX_CONCURRENT_TRANSLATIONS,
+        "translation_timeout_seconds": TRANSLATION_TIMEOUT
+    },
+    "payment_tiers": {
+        "professional": {"price": 20, "limit": 20},
+        "enterprise": {"price": 999, "limit": "unlimited"}
+    }
+}
+ROOT_INFO_JSON = dumps_json(ROOT_INFO)
+
 @app.get("/")
 async def root():
     """API info"""
-    return {
-        "service": "Document Translation API - Enhanced for Large Files",
-        "version": "4.0.0",
-        "status": "operational",
-        "translator_available": TRANSLATOR_AVAILABLE,
-        "features": [
-            "Background processing for large files",
-            "Real-time progress tracking",
-            "File size validation (max 100MB)",
-            "Chunked file uploads",
-            "Task management and cancellation",
-            "Concurrent translation limits",
-            "Automatic retry with exponential backoff",
-            "Progress polling for long-running tasks",
-            "Multiple payment tiers (Professional & Enterprise)"
-        ],
-        "limits": {
-            "max_file_size_mb": MAX_FILE_SIZE_MB,
-            "max_concurrent_translations": MAX_CONCURRENT_TRANSLATIONS,
-            "translation_timeout_seconds": TRANSLATION_TIMEOUT
-        },
-        "payment_tiers": {
-            "professional": {"price": 20, "limit": 20},
-            "enterprise": {"price": 999, "limit": "unlimited"}
-        }
-    }
+    return Response(content=ROOT_INFO_JSON, media_type="application/json")
+
+# Status pages poll /health constantly, so the encoded body is reused
+# for a couple of seconds instead of being rebuilt on every hit
+HEALTH_CACHE_SECONDS = 2
+_health_cache = (0.0, b"")
 
 @app.get("/health")
 async def health():
     """Health check with task stats"""
-    active_tasks = sum(1 for t in task_manager.tasks.values() if t["status"] == "processing")
-    queued_tasks = sum(1 for t in task_manager.tasks.values() if t["status"] == "queued")
+    global _health_cache
+    now = time.monotonic()
+    if now - _health_cache[0] < HEALTH_CACHE_SECONDS:
+        return Response(content=_health_cache[1], media_type="application/json")
     
-    return {
+    # Maintained by the task manager, so no scan over every task
+    active_tasks = task_manager.count_by_status("processing")
+    queued_tasks = task_manager.count_by_status("queued")
+    
+    # With Redis, the counts are round trips - keep them off the loop
+    storage = await run_store(storage_counts)
+    
+    payload = dumps_json({
         "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "storage": {
-            "users": len(users),
-            "sessions": len(sessions),
-            "documents": len(documents),
-            "payments": len(payments),
-            "tasks": len(task_manager.tasks)
-        },
+        "timestamp": now_iso(),
+        "storage": {**storage, "tasks": len(task_manager.tasks)},
         "tasks": {
             "active": active_tasks,
             "queued": queued_tasks,
             "total": len(task_manager.tasks)
         },
         "translator": "available" if TRANSLATOR_AVAILABLE else "unavailable"
-    }
+    })
+    _health_cache = (now, payload)
+    return Response(content=payload, media_type="application/json")
 
 if __name__ == '__main__':
     print("\n" + "="*70)
@@ -1221,9 +2298,21 @@ if __name__ == '__main__':
     print(f"Max file size: {MAX_FILE_SIZE_MB}MB")
     print(f"Max concurrent translations: {MAX_CONCURRENT_TRANSLATIONS}")
     print(f"Translation timeout: {TRANSLATION_TIMEOUT}s")
+    print(f"Event loop: {'uvloop' if UVLOOP_SUPPORT else 'asyncio'}, "
+          f"HTTP parser: {'httptools' if HTTPTOOLS_SUPPORT else 'h11'}")
     print(f"Payment links configured:")
     for tier, url in PAYSTACK_PAYMENT_LINKS.items():
         print(f"  - {tier}: {url}")
     print("="*70 + "\n")
     
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # A single worker: translation tasks and their progress live in this
+    # process, so a status poll must reach the worker that owns the task.
+    # log_requests already logs each request, so uvicorn's access log is off
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop" if UVLOOP_SUPPORT else "asyncio",
+        http="httptools" if HTTPTOOLS_SUPPORT else "h11",
+        access_log=False
+    )
\ No newline at end of file
@@ -20,32 +20,43 @@ import re
 import json
 import hashlib
 import copy
+import importlib.util
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 
-# Try to import NLTK (optional - will fallback if not available)
-try:
-    import nltk
-    from nltk.tokenize import sent_tokenize
-    
+# Progress goes through logging so per-segment messages cost nothing unless
+# enabled (the API routes this logger through its queued handler)
+logger = logging.getLogger("document_translator")
+
+# NLTK is optional and only used to split very long text blocks, so it is
+# imported (and its punkt data downloaded) on first use, not at import time
+NLTK_AVAILABLE = importlib.util.find_spec('nltk') is not None
+if not NLTK_AVAILABLE:
+    logger.info("NLTK not available - using simple sentence splitting")
+
+
+@lru_cache(maxsize=1)
+def load_sentence_tokenizer():
+    """Import NLTK's sent_tokenize, fetching punkt data if missing"""
     try:
-        nltk.data.find('tokenizers/punkt')
-    except LookupError:
-        try:
-            nltk.download('punkt', quiet=True)
-        except:
-            pass
+        import nltk
+        from nltk.tokenize import sent_tokenize
+    except Exception as e:
+        logger.warning("NLTK failed to load (%s) - using simple sentence splitting", e)
+        return None
     
-    try:
-        nltk.data.find('tokenizers/punkt_tab')
-    except LookupError:
+    for resource in ('punkt', 'punkt_tab'):
         try:
-            nltk.download('punkt_tab', quiet=True)
-        except:
-            pass
+            nltk.data.find(f'tokenizers/{resource}')
+        except LookupError:
+            try:
+                nltk.download(resource, quiet=True)
+            except:
+                pass
     
-    NLTK_AVAILABLE = True
-except:
-    NLTK_AVAILABLE = False
-    print("Warning: NLTK not available - using simple sentence splitting")
+    return sent_tokenize
 
 # Try to import python-docx
 try:
@@ -53,18 +64,99 @@ try:
     from docx.shared import Pt, Inches, RGBColor
     from docx.enum.text import WD_ALIGN_PARAGRAPH
     DOCX_SUPPORT = True
-    print("✓ python-docx loaded successfully")
+    logger.debug("python-docx loaded")
 except ImportError:
     DOCX_SUPPORT = False
-    print("Warning: python-docx not available. Install with: pip install python-docx")
+    logger.warning("python-docx not available. Install with: pip install python-docx")
 
 # Try to import PDF libraries
 try:
     import fitz  # PyMuPDF
     PDF_SUPPORT = True
+    # Default "dict" flags minus TEXT_PRESERVE_IMAGES - only text blocks
+    # are translated, so don't copy every image's bytes into the result
+    PDF_TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
 except ImportError:
     PDF_SUPPORT = False
-    print("Warning: PDF support not available")
+    logger.warning("PDF support not available")
+
+
+# deep-translator sends every request with a bare requests.get(), which opens
+# a new HTTPS connection (and TLS handshake) per translated chunk.
+# SessionGoogleTranslator sends the same request through a keep-alive
+# Session instead. Sessions aren't thread-safe, so each thread has its own.
+HTTP_POOL_SIZE = 2  # Keep-alive connections per thread to the translation backend
+TRANSLATE_CONCURRENCY = int(os.getenv("TRANSLATE_CONCURRENCY", "4"))  # Parallel requests per document
+PREFETCH_MAX_CHARS = 4500  # Longer blocks keep the throttled sentence-chunk path
+
+try:
+    import requests
+    from bs4 import BeautifulSoup
+    from deep_translator.exceptions import RequestError, TooManyRequests, TranslationNotFound
+    from deep_translator.validate import is_empty, is_input_valid, request_failed
+    
+    _http_local = threading.local()
+    
+    def thread_http_session():
+        """requests.Session owned by the calling thread"""
+        session = getattr(_http_local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _http_local.session = session
+        return session
+    
+    class SessionGoogleTranslator(GoogleTranslator):
+        """GoogleTranslator that reuses the calling thread's HTTP connections"""
+        
+        def translate(self, text: str, **kwargs) -> str:
+            if not is_input_valid(text, max_chars=5000):
+                return text
+            text = text.strip()
+            if self._same_source_target() or is_empty(text):
+                return text
+            params = {**self._url_params, "tl": self._target, "sl": self._source, self.payload_key: text}
+            response = thread_http_session().get(self._base_url, params=params, proxies=self.proxies)
+            if response.status_code == 429:
+                raise TooManyRequests()
+            if request_failed(status_code=response.status_code):
+                raise RequestError()
+            
+            soup = BeautifulSoup(response.text, "html.parser")
+            element = (soup.find(self._element_tag, self._element_query)
+                       or soup.find(self._element_tag, self._alt_element_query))
+            if not element:
+                raise TranslationNotFound(text)
+            return element.get_text(strip=True)
+except ImportError as e:
+    SessionGoogleTranslator = GoogleTranslator  # One connection per request
+    logger.warning("Keep-alive HTTP sessions not available (%s)", e)
+
+
+# Precompiled filters for should_translate_text
+URL_PREFIXES = ('http://', 'https://', 'www.')
+NUMERIC_ONLY_PATTERN = re.compile(r'^[\d\s\-/.,]+$')
+LETTER_PATTERN = re.compile(r'[a-zA-Z\u0080-\uFFFF]')
+WHITESPACE_PATTERN = re.compile(r'\s')
+
+# Fallback sentence splitter used when NLTK isn't installed
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+
+def text_cache_key(text):
+    """
+    Hash text for the translation caches
+    
+    MD5 is only used as a cache key, so flag it as non-security use
+    (plain md5() raises on FIPS-enabled OpenSSL builds).
+    """
+    return hashlib.md5(text.encode('utf-8'), usedforsecurity=False).hexdigest()
+
+
+class TranslationAborted(Exception):
+    """Raised from progress_callback to stop a translation part-way"""
 
 
 class DocumentTranslator:
@@ -72,30 +164,91 @@ class DocumentTranslator:
     Enhanced document translator using python-docx for reliable DOCX processing
     """
     
-    def __init__(self, source_lang='auto', target_lang='es'):
+    def __init__(self, source_lang='auto', target_lang='es', shared_cache=None):
         """
         Initialize the translator
         
         Args:
             source_lang: Source language code (default: 'auto' for auto-detect)
             target_lang: Target language code (default: 'es' for Spanish)
+            shared_cache: Optional mapping shared across translators (supports
+                get() and item assignment), keyed by language pair and text hash
         """
         self.source_lang = source_lang
         self.target_lang = target_lang
         self.translation_cache = {}
+        self.shared_cache = shared_cache
         self.context_cache = {}
         self.use_context = True
         self.progress_file = None
+        self.progress_callback = None  # Called with (done, total) as a document progresses
         self.total_segments = 0
         self.translated_segments = 0
+        self.processed_segments = 0  # Elements visited so far, for progress
+        self.document_segments = set()  # Cache keys of texts in the current document
+        self.count_lock = threading.Lock()  # translated_segments is bumped from prefetch threads
+        self.prefetch_executor = None  # Created on first prefetch, shut down after the document
         
         # Initialize the deep-translator instance
         try:
-            self.translator = GoogleTranslator(source=source_lang, target=target_lang)
-            print(f"✓ Translator initialized: {source_lang} -> {target_lang}")
+            self.translator = SessionGoogleTranslator(source=source_lang, target=target_lang)
+            logger.debug("Translator initialized: %s -> %s", source_lang, target_lang)
         except Exception as e:
-            print(f"✗ Failed to initialize translator: {e}")
+            logger.error("Failed to initialize translator: %s", e)
             self.translator = None
+        
+        # GoogleTranslator keeps per-request state, so each thread gets its own
+        self._local = threading.local()
+        self._local.translator = self.translator
+    
+    def _backend(self):
+        """GoogleTranslator for the calling thread"""
+        translator = getattr(self._local, 'translator', None)
+        if translator is None:
+            translator = SessionGoogleTranslator(source=self.source_lang, target=self.target_lang)
+            self._local.translator = translator
+        return translator
+    
+    def reset_document_state(self):
+        """
+        Reset per-document progress so the instance can be reused for
+        another document (the translation caches are kept)
+        """
+        self.total_segments = 0
+        self.translated_segments = 0
+        self.processed_segments = 0
+        self.document_segments = set()
+        self._shutdown_prefetch()
+    
+    def _shutdown_prefetch(self):
+        """Stop the current document's prefetch threads (and their translators)"""
+        if self.prefetch_executor is not None:
+            self.prefetch_executor.shutdown(wait=True, cancel_futures=True)
+            self.prefetch_executor = None
+    
+    def _report_progress(self, done, total):
+        """Pass progress to progress_callback, if one is set"""
+        if self.progress_callback is not None:
+            self.progress_callback(done, total)
+    
+    def _page_done(self, page_num):
+        """Count a finished PDF page (0-based page_num) toward progress"""
+        self.processed_segments = page_num + 1
+        self._report_progress(self.processed_segments, self.total_segments)
+    
+    def _shared_cache_key(self, text_hash):
+        """Key for the shared cache - includes the language pair"""
+        return f"{self.source_lang}:{self.target_lang}:{text_hash}"
+    
+    def _cache_translation(self, text, text_hash, result):
+        """Store a translation in the local and shared caches"""
+        self.translation_cache[text_hash] = result
+        # Failed chunks come back unchanged - keep those out of the shared cache
+        if self.shared_cache is not None and result != text:
+            try:
+                self.shared_cache[self._shared_cache_key(text_hash)] = result
+            except Exception as e:
+                logger.warning("Shared cache write failed: %s", e)
     
     def split_into_sentences(self, text):
         """
@@ -104,16 +257,16 @@ class DocumentTranslator:
         if not text or not text.strip():
             return []
         
-        if NLTK_AVAILABLE:
+        sent_tokenize = load_sentence_tokenizer() if NLTK_AVAILABLE else None
+        if sent_tokenize:
             try:
-                sentences = sent_tokenize(text)
-                return [s.strip() for s in sentences if s.strip()]
+                # Strip each sentence once instead of once to test and again to keep
+                return [s for s in map(str.strip, sent_tokenize(text)) if s]
             except Exception as e:
-                print(f"Warning: NLTK tokenization failed: {e}")
+                logger.warning("NLTK tokenization failed: %s", e)
         
         # Fallback: improved sentence splitting
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        return [s.strip() for s in sentences if s.strip()]
+        return [s for s in map(str.strip, SENTENCE_BOUNDARY.split(text)) if s]
     
     def translate_chunk(self, chunk):
         """
@@ -123,7 +276,7 @@ class DocumentTranslator:
             return chunk
         
         # Check cache
-        cache_key = hashlib.md5(chunk.encode()).hexdigest()
+        cache_key = text_cache_key(chunk)
         if cache_key in self.context_cache:
             return self.context_cache[cache_key]
         
@@ -135,21 +288,17 @@ class DocumentTranslator:
             try:
                 if attempt > 0:
                     delay = base_delay * (2 ** (attempt - 1))
-                    print(f"  Retry {attempt}/{max_retries} after {delay:.1f}s delay...")
+                    logger.debug("Retry %d/%d after %.1fs delay", attempt, max_retries, delay)
                     time.sleep(delay)
                 
-                # Reinitialize translator if needed
-                if self.translator is None:
-                    self.translator = GoogleTranslator(source=self.source_lang, target=self.target_lang)
-                
-                # Translate
-                translated = self.translator.translate(chunk)
+                # Translate (the backend is created on demand if needed)
+                translated = self._backend().translate(chunk)
                 
                 # Validate result
                 if translated is None or not translated:
                     if attempt < max_retries - 1:
                         continue
-                    print(f"  Warning: Translation returned empty for chunk")
+                    logger.warning("Translation returned empty for chunk")
                     translated = chunk
                 
                 if not isinstance(translated, str):
@@ -157,7 +306,8 @@ class DocumentTranslator:
                 
                 # Cache and return
                 self.context_cache[cache_key] = translated
-                self.translated_segments += 1
+                with self.count_lock:
+                    self.translated_segments += 1
                 
                 return translated
                 
@@ -165,24 +315,24 @@ class DocumentTranslator:
                 error_msg = str(e).lower()
                 
                 if 'rate' in error_msg or 'limit' in error_msg or '429' in str(e):
-                    print(f"  Rate limit detected, using longer delay...")
+                    logger.warning("Rate limit detected, using longer delay")
                     delay = base_delay * 3 * (2 ** attempt)
                     time.sleep(min(delay, 30))
                 elif 'connection' in error_msg or 'timeout' in error_msg:
-                    print(f"  Connection issue, retrying...")
+                    logger.warning("Connection issue, retrying")
                 else:
-                    print(f"  Translation error: {e}")
+                    logger.warning("Translation error: %s", e)
                 
                 if attempt == max_retries - 1:
-                    print(f"  All retries exhausted, using original text")
+                    logger.error("All retries exhausted, using original text")
                     self.context_cache[cache_key] = chunk
                     return chunk
                 
                 try:
                     time.sleep(1)
-                    self.translator = GoogleTranslator(source=self.source_lang, target=self.target_lang)
+                    self._local.translator = SessionGoogleTranslator(source=self.source_lang, target=self.target_lang)
                 except Exception as recreate_error:
-                    print(f"  Failed to recreate translator: {recreate_error}")
+                    logger.error("Failed to recreate translator: %s", recreate_error)
         
         return chunk
     
@@ -194,25 +344,37 @@ class DocumentTranslator:
             return text
         
         # Check cache
-        text_hash = hashlib.md5(text.encode()).hexdigest()
+        text_hash = text_cache_key(text)
+        self.document_segments.add(text_hash)
         if text_hash in self.translation_cache:
             return self.translation_cache[text_hash]
         
+        # Segments translated by other translators (other documents/users)
+        if self.shared_cache is not None:
+            try:
+                cached = self.shared_cache.get(self._shared_cache_key(text_hash))
+            except Exception as e:
+                logger.warning("Shared cache read failed: %s", e)
+                cached = None
+            if cached is not None:
+                self.translation_cache[text_hash] = cached
+                return cached
+        
         # If text is short, translate directly
         if len(text) <= max_chunk_size:
             result = self.translate_chunk(text)
-            self.translation_cache[text_hash] = result
+            self._cache_translation(text, text_hash, result)
             return result
         
         try:
-            print(f"\n📄 Processing large text block ({len(text)} characters)...")
+            logger.debug("Processing large text block (%d characters)", len(text))
             
             sentences = self.split_into_sentences(text)
             
             if not sentences:
                 return text
             
-            print(f"  Split into {len(sentences)} sentences")
+            logger.debug("Split into %d sentences", len(sentences))
             
             # Group sentences into optimal chunks
             chunks = []
@@ -252,7 +414,7 @@ class DocumentTranslator:
             if current_chunk:
                 chunks.append(' '.join(current_chunk))
             
-            print(f"  Optimized into {len(chunks)} chunks for translation")
+            logger.debug("Optimized into %d chunks for translation", len(chunks))
             
             # Translate each chunk
             translated_chunks = []
@@ -260,7 +422,7 @@ class DocumentTranslator:
             
             for i, chunk in enumerate(chunks):
                 chunk_num = i + 1
-                print(f"\n  Translating chunk {chunk_num}/{len(chunks)} ({len(chunk)} chars)...")
+                logger.debug("Translating chunk %d/%d (%d chars)", chunk_num, len(chunks), len(chunk))
                 
                 try:
                     translated = self.translate_chunk(chunk)
@@ -278,27 +440,27 @@ class DocumentTranslator:
                         time.sleep(delay)
                     
                 except Exception as e:
-                    print(f"    Error translating chunk {chunk_num}: {e}")
+                    logger.warning("Error translating chunk %d: %s", chunk_num, e)
                     consecutive_successes = 0
                     translated_chunks.append(chunk)
                     if i < len(chunks) - 1:
                         time.sleep(3.0)
             
             result = ' '.join(translated_chunks)
-            self.translation_cache[text_hash] = result
+            self._cache_translation(text, text_hash, result)
             
-            print(f"\n  ✓ Large text translation complete!")
+            logger.debug("Large text translation complete")
             
             return result
             
         except Exception as e:
-            print(f"\n❌ Context translation failed: {e}")
+            logger.warning("Context translation failed: %s", e)
             try:
                 result = self.translate_chunk(text)
-                self.translation_cache[text_hash] = result
+                self._cache_translation(text, text_hash, result)
                 return result
             except Exception as fallback_error:
-                print(f"  Fallback also failed: {fallback_error}")
+                logger.error("Fallback also failed: %s", fallback_error)
                 return text
     
     def translate_text(self, text):
@@ -308,9 +470,72 @@ class DocumentTranslator:
         try:
             return self.translate_with_context(text, max_chunk_size=4500)
         except Exception as e:
-            print(f"Error in translate_text: {e}")
+            logger.error("Error in translate_text: %s", e)
             return text
     
+    def prefetch_translations(self, texts, count_progress=False):
+        """
+        Translate the distinct, uncached texts of a document concurrently
+        (up to TRANSLATE_CONCURRENCY requests in flight) so the sequential
+        formatting pass that follows is served from the cache. With
+        count_progress, each prefetched segment also counts as a unit of
+        document progress.
+        """
+        pending = set()
+        for text in texts:
+            if (len(text) <= PREFETCH_MAX_CHARS
+                    and self.should_translate_text(text)
+                    and text_cache_key(text) not in self.translation_cache):
+                pending.add(text)
+        
+        if TRANSLATE_CONCURRENCY <= 1 or len(pending) < 2:
+            return
+        
+        logger.debug("Prefetching %d unique segments (%d at a time)", len(pending), TRANSLATE_CONCURRENCY)
+        if count_progress:
+            self.total_segments += len(pending)
+        # One pool per document, so every page of a PDF reuses the same
+        # threads and their translators and HTTP connections
+        if self.prefetch_executor is None:
+            self.prefetch_executor = ThreadPoolExecutor(max_workers=TRANSLATE_CONCURRENCY)
+        futures = [self.prefetch_executor.submit(self.translate_text, text) for text in pending]
+        try:
+            # Report after each finished segment - this is where the
+            # network time goes, so progress_callback must be able to
+            # raise TranslationAborted from here
+            for future in as_completed(futures):
+                future.result()
+                if count_progress:
+                    self.processed_segments += 1
+                self._report_progress(self.processed_segments, self.total_segments)
+        except BaseException:
+            for future in futures:
+                future.cancel()  # Only requests already in flight finish
+            raise
+    
+    def _iter_docx_texts(self, doc):
+        """Yield the text of every paragraph translate_docx visits"""
+        def table_texts(table):
+            for row in table.rows:
+                for cell in row.cells:
+                    for para in cell.paragraphs:
+                        yield para.text
+                    for nested_table in cell.tables:
+                        yield from table_texts(nested_table)
+        
+        for para in doc.paragraphs:
+            yield para.text
+        for table in doc.tables:
+            yield from table_texts(table)
+        for section in doc.sections:
+            for header_footer in [section.first_page_header, section.header, section.even_page_header,
+                                  section.first_page_footer, section.footer, section.even_page_footer]:
+                if header_footer:
+                    for para in header_footer.paragraphs:
+                        yield para.text
+                    for table in header_footer.tables:
+                        yield from table_texts(table)
+    
     def should_translate_text(self, text):
         """
         Determine if text should be translated
@@ -323,20 +548,20 @@ class DocumentTranslator:
         if not text or len(text) < 2:
             return False
         
-        # Don't translate email addresses
-        if '@' in text and '.' in text and len(text.split()) == 1:
+        # Don't translate email addresses (single token - no inner whitespace)
+        if '@' in text and '.' in text and not WHITESPACE_PATTERN.search(text):
             return False
         
         # Don't translate URLs
-        if text.startswith(('http://', 'https://', 'www.')):
+        if text.startswith(URL_PREFIXES):
             return False
         
         # Don't translate pure numbers
-        if re.match(r'^[\d\s\-/.,]+$', text):
+        if NUMERIC_ONLY_PATTERN.match(text):
             return False
         
         # Don't translate if only whitespace/special chars
-        if not re.search(r'[a-zA-Z\u0080-\uFFFF]', text):
+        if not LETTER_PATTERN.search(text):
             return False
             
         return True
@@ -355,13 +580,8 @@ class DocumentTranslator:
         if not DOCX_SUPPORT:
             raise Exception("python-docx not available. Install with: pip install python-docx")
         
-        print(f"\n{'='*60}")
-        print(f"DOCX Document Translator (python-docx)")
-        print(f"{'='*60}")
-        print(f"Input:  {input_docx}")
-        print(f"Output: {output_docx}")
-        print(f"Source Language: {self.source_lang}")
-        print(f"Target Language: {self.target_lang}")
+        logger.info("DOCX translation: %s -> %s (%s -> %s)",
+                    input_docx, output_docx, self.source_lang, self.target_lang)
         
         # Check file exists
         if not os.path.exists(input_docx):
@@ -369,37 +589,37 @@ class DocumentTranslator:
         
         # Check file size
         file_size = os.path.getsize(input_docx) / (1024 * 1024)
-        print(f"File Size: {file_size:.2f} MB")
-        
-        if file_size > 10:
-            print(f"⚠️  Large file detected - using optimized processing")
-        
-        print(f"{'='*60}\n")
+        logger.info("File size: %.2f MB%s", file_size,
+                    " (large file - using optimized processing)" if file_size > 10 else "")
         
         try:
             # Load the document
-            print("Step 1: Loading document...")
+            logger.debug("Step 1: Loading document")
             doc = DocxDocument(input_docx)
             
             # Count elements for progress tracking
             total_elements = self._count_translatable_elements(doc)
-            print(f"  Found {total_elements} translatable elements")
+            logger.debug("Found %d translatable elements", total_elements)
             
             self.total_segments = total_elements
             self.translated_segments = 0
+            self.processed_segments = 0
+            
+            # Translate unique segments in parallel up front
+            self.prefetch_translations(self._iter_docx_texts(doc), count_progress=True)
             
             # Translate paragraphs in main body
-            print("\nStep 2: Translating main document body...")
+            logger.debug("Step 2: Translating main document body")
             for para in doc.paragraphs:
                 self._translate_paragraph(para)
             
             # Translate tables
-            print("\nStep 3: Translating tables...")
+            logger.debug("Step 3: Translating tables")
             for table in doc.tables:
                 self._translate_table(table)
             
             # Translate headers
-            print("\nStep 4: Translating headers...")
+            logger.debug("Step 4: Translating headers")
             for section in doc.sections:
                 # First page header
                 if section.first_page_header:
@@ -423,7 +643,7 @@ class DocumentTranslator:
                         self._translate_table(table)
             
             # Translate footers
-            print("\nStep 5: Translating footers...")
+            logger.debug("Step 5: Translating footers")
             for section in doc.sections:
                 # First page footer
                 if section.first_page_footer:
@@ -447,35 +667,34 @@ class DocumentTranslator:
                         self._translate_table(table)
             
             # Save the translated document
-            print("\nStep 6: Saving translated document...")
+            logger.debug("Step 6: Saving translated document")
             doc.save(output_docx)
             
             # Verify output
             if os.path.exists(output_docx):
                 output_size = os.path.getsize(output_docx) / (1024 * 1024)
-                print(f"\n✓ Output file created: {output_size:.2f} MB")
+                logger.debug("Output file created: %.2f MB", output_size)
             
-            print(f"\n{'='*60}")
-            print(f"Translation Complete!")
-            print(f"{'='*60}")
-            print(f"Translated segments: {self.translated_segments}")
-            print(f"Cached translations: {len(self.translation_cache)}")
-            print(f"Output saved to: {output_docx}")
-            print(f"{'='*60}\n")
+            logger.info("Translation complete: %d segments translated, %d cached, saved to %s",
+                        self.translated_segments, len(self.translation_cache), output_docx)
             
+        except TranslationAborted as e:
+            logger.info("Translation stopped: %s", e)
+            raise
         except Exception as e:
-            print(f"\n❌ Error during translation: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error during translation: %s", e)
             raise
+        finally:
+            self._shutdown_prefetch()
     
     def _count_translatable_elements(self, doc):
         """Count all translatable elements in the document"""
         count = 0
         
-        # Count paragraphs
+        # Count paragraphs (para.text rebuilds the string from runs on every
+        # access, so each paragraph is read once)
         for para in doc.paragraphs:
-            if para.text and self.should_translate_text(para.text):
+            if self.should_translate_text(para.text):
                 count += 1
         
         # Count table cells
@@ -483,7 +702,7 @@ class DocumentTranslator:
             for row in table.rows:
                 for cell in row.cells:
                     for para in cell.paragraphs:
-                        if para.text and self.should_translate_text(para.text):
+                        if self.should_translate_text(para.text):
                             count += 1
         
         # Count headers/footers
@@ -493,7 +712,7 @@ class DocumentTranslator:
                                   section.even_page_header, section.even_page_footer]:
                 if header_footer:
                     for para in header_footer.paragraphs:
-                        if para.text and self.should_translate_text(para.text):
+                        if self.should_translate_text(para.text):
                             count += 1
         
         return count
@@ -502,13 +721,13 @@ class DocumentTranslator:
         """
         Translate a paragraph while preserving formatting
         """
-        if not paragraph.text or not self.should_translate_text(paragraph.text):
+        # Read the text once - it is rebuilt from the runs on every access
+        full_text = paragraph.text
+        
+        if not self.should_translate_text(full_text):
             return
         
         try:
-            # Get the full text
-            full_text = paragraph.text
-            
             # Translate the full text
             translated_text = self.translate_text(full_text)
             
@@ -548,12 +767,16 @@ class DocumentTranslator:
             
             # Update progress
             self.translated_segments += 1
-            if self.total_segments > 0 and self.translated_segments % 10 == 0:
-                progress = (self.translated_segments / self.total_segments) * 100
-                print(f"  Progress: {self.translated_segments}/{self.total_segments} ({progress:.1f}%)")
+            self.processed_segments += 1
+            if self.total_segments > 0 and self.processed_segments % 10 == 0:
+                progress = (self.processed_segments / self.total_segments) * 100
+                logger.debug("Progress: %d/%d (%.1f%%)", self.processed_segments, self.total_segments, progress)
+                self._report_progress(self.processed_segments, self.total_segments)
                 
+        except TranslationAborted:
+            raise
         except Exception as e:
-            print(f"  Warning: Could not translate paragraph: {e}")
+            logger.warning("Could not translate paragraph: %s", e)
     
     def _translate_table(self, table):
         """
@@ -569,8 +792,10 @@ class DocumentTranslator:
                     for nested_table in cell.tables:
                         self._translate_table(nested_table)
                         
+        except TranslationAborted:
+            raise
         except Exception as e:
-            print(f"  Warning: Could not translate table: {e}")
+            logger.warning("Could not translate table: %s", e)
     
     def translate_pdf(self, input_pdf, output_pdf):
         """
@@ -579,42 +804,64 @@ class DocumentTranslator:
         if not PDF_SUPPORT:
             raise Exception("PDF support not available. Install PyMuPDF: pip install pymupdf")
         
-        print(f"\n{'='*60}")
-        print(f"PDF Document Translator")
-        print(f"{'='*60}")
+        logger.info("PDF translation: %s -> %s (%s -> %s)",
+                    input_pdf, output_pdf, self.source_lang, self.target_lang)
         
         try:
             doc = fitz.open(input_pdf)
             output_doc = fitz.open()
             
             total_pages = len(doc)
-            print(f"Processing {total_pages} pages...")
+            logger.debug("Processing %d pages", total_pages)
+            
+            # Progress is counted in pages; checkpoints inside a page's
+            # prefetch report the pages finished so far
+            self.total_segments = total_pages
+            self.processed_segments = 0
             
             for page_num in range(total_pages):
-                print(f"\nPage {page_num + 1}/{total_pages}...")
+                logger.debug("Page %d/%d", page_num + 1, total_pages)
                 page = doc[page_num]
                 new_page = output_doc.new_page(width=page.rect.width, height=page.rect.height)
                 
-                # Copy background
+                # Parse the page once, then probe it with the cheap plain-text
+                # extraction; only pages that actually have a text layer pay
+                # for the much slower "dict" output
+                textpage = page.get_textpage(flags=PDF_TEXT_FLAGS)
+                if not textpage.extractText().strip():
+                    # Nothing to translate - embed the original page as-is
+                    # instead of rasterizing its (often graphics-heavy) content
+                    logger.debug("No text layer, keeping page as-is")
+                    new_page.show_pdf_page(new_page.rect, doc, page_num)
+                    self._page_done(page_num)
+                    continue
+                
+                # Copy background (the pixmap goes in directly, skipping a
+                # PNG encode/decode round trip)
                 pix = page.get_pixmap(matrix=fitz.Matrix(1, 1), alpha=False)
-                img_bytes = pix.tobytes("png")
-                new_page.insert_image(new_page.rect, stream=img_bytes, overlay=False)
+                new_page.insert_image(new_page.rect, pixmap=pix, overlay=False)
                 
                 # Translate text blocks
-                blocks = page.get_text("dict")["blocks"]
+                blocks = page.get_text("dict", textpage=textpage)["blocks"]
                 text_blocks = [b for b in blocks if b["type"] == 0]
                 
-                print(f"  Found {len(text_blocks)} text blocks")
+                logger.debug("Found %d text blocks", len(text_blocks))
                 
-                for block_num, block in enumerate(text_blocks, 1):
-                    block_text = ""
-                    for line in block.get("lines", []):
-                        for span in line.get("spans", []):
-                            block_text += span.get("text", "") + " "
-                    
-                    block_text = block_text.strip()
+                block_texts = [
+                    " ".join(
+                        span.get("text", "")
+                        for line in block.get("lines", [])
+                        for span in line.get("spans", [])
+                    ).strip()
+                    for block in text_blocks
+                ]
+                
+                # Translate the page's unique blocks in parallel up front
+                self.prefetch_translations(block_texts)
+                
+                for block_num, (block, block_text) in enumerate(zip(text_blocks, block_texts), 1):
                     if block_text and self.should_translate_text(block_text):
-                        print(f"  Translating block {block_num}/{len(text_blocks)}...")
+                        logger.debug("Translating block %d/%d", block_num, len(text_blocks))
                         translated = self.translate_text(block_text)
                         
                         bbox = fitz.Rect(block["bbox"])
@@ -624,18 +871,23 @@ class DocumentTranslator:
                         
                         new_page.draw_rect(bbox, color=(1, 1, 1), fill=(1, 1, 1))
                         new_page.insert_textbox(bbox, translated, fontsize=font_size)
+                
+                self._page_done(page_num)
             
             output_doc.save(output_pdf)
             output_doc.close()
             doc.close()
             
-            print(f"\n✓ Translation complete: {output_pdf}")
+            logger.info("Translation complete: %s", output_pdf)
             
+        except TranslationAborted as e:
+            logger.info("Translation stopped: %s", e)
+            raise
         except Exception as e:
-            print(f"❌ Error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error during PDF translation: %s", e)
             raise
+        finally:
+            self._shutdown_prefetch()
     
     def translate_document(self, input_file, output_file):
         """
@@ -667,6 +919,10 @@ def main():
         print(f"Error: Input file '{input_file}' not found")
         sys.exit(1)
     
+    # Show this module's full progress on the console, as before
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logger.setLevel(logging.DEBUG)
+    
     translator = DocumentTranslator(source_lang=source_lang, target_lang=target_lang)
     translator.translate_document(input_file, output_file)
 
@@ -10,20 +10,37 @@ Provides various metrics to evaluate translation quality:
 """
 
 import re
-from collections import Counter
+import hashlib
+from collections import Counter, OrderedDict, defaultdict, deque
 import math
 
 
+# Word tokenizer shared by the word-level metrics
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
 class TranslationEvaluator:
     """Evaluate translation quality using multiple metrics"""
     
-    def __init__(self):
+    def __init__(self, max_cache_size=256, max_reference_cache_size=32):
         self.metrics = {}
+        # LRU cache of evaluate_all results keyed by content hash
+        self.max_cache_size = max_cache_size
+        self.cache = OrderedDict()
+        # Reference-side tokens and n-gram counts, reused when several
+        # hypotheses are scored against the same reference
+        self.max_reference_cache_size = max_reference_cache_size
+        self.reference_cache = OrderedDict()
+    
+    def _cache_key(self, reference, hypothesis):
+        """BLAKE2b digest of the inputs (fastest cryptographic hash in hashlib)"""
+        data = f"{reference}\0{hypothesis}".encode('utf-8', 'surrogatepass')
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
     
     def tokenize(self, text):
         """Simple tokenization"""
         # Convert to lowercase and split by whitespace and punctuation
-        tokens = re.findall(r'\w+', text.lower())
+        tokens = TOKEN_PATTERN.findall(text.lower())
         return tokens
     
     def get_ngrams(self, tokens, n):
@@ -35,6 +52,32 @@ class TranslationEvaluator:
         text = text.lower().replace(' ', '')
         return [text[i:i+n] for i in range(len(text)-n+1)]
     
+    def _ngram_counts(self, tokens, n):
+        """Count n-grams with zip over shifted slices (C-level iteration)"""
+        return Counter(zip(*[tokens[i:] for i in range(n)]))
+    
+    def _reference_profile(self, reference):
+        """Tokens and BLEU/ChrF n-gram counts of a reference, memoized"""
+        profile = self.reference_cache.get(reference)
+        if profile is not None:
+            self.reference_cache.move_to_end(reference)
+            return profile
+        
+        tokens = self.tokenize(reference)
+        chars = reference.lower().replace(' ', '')
+        profile = {
+            'tokens': tokens,
+            'word_ngrams': {n: self._ngram_counts(tokens, n) for n in range(1, 5)},
+            'char_ngrams': {n: Counter(chars[j:j+n] for j in range(len(chars)-n+1)) for n in range(1, 7)},
+        }
+        
+        if self.max_reference_cache_size > 0:
+            self.reference_cache[reference] = profile
+            if len(self.reference_cache) > self.max_reference_cache_size:
+                self.reference_cache.popitem(last=False)
+        
+        return profile
+    
     def calculate_bleu(self, reference, hypothesis, max_n=4):
         """
         Calculate BLEU score
@@ -47,9 +90,10 @@ class TranslationEvaluator:
         Returns:
             BLEU score (0-100)
         """
-        ref_tokens = self.tokenize(reference)
-        hyp_tokens = self.tokenize(hypothesis)
-        
+        return self._bleu_from_tokens(self.tokenize(reference), self.tokenize(hypothesis), max_n)
+    
+    def _bleu_from_tokens(self, ref_tokens, hyp_tokens, max_n=4, ref_counts=None):
+        """BLEU on pre-tokenized input, optionally with precomputed reference n-grams"""
         if not hyp_tokens:
             return 0.0
         
@@ -66,16 +110,17 @@ class TranslationEvaluator:
         precisions = []
         
         for n in range(1, max_n + 1):
-            ref_ngrams = Counter(self.get_ngrams(ref_tokens, n))
-            hyp_ngrams = Counter(self.get_ngrams(hyp_tokens, n))
+            ref_ngrams = ref_counts[n] if ref_counts and n in ref_counts else self._ngram_counts(ref_tokens, n)
+            hyp_ngrams = self._ngram_counts(hyp_tokens, n)
             
             if not hyp_ngrams:
                 precisions.append(0.0)
                 continue
             
-            # Count matches
+            # Count matches; the hypothesis has exactly one n-gram per
+            # start position, so the total needs no pass over the counter
             matches = sum((hyp_ngrams & ref_ngrams).values())
-            total = sum(hyp_ngrams.values())
+            total = hyp_len - n + 1
             
             precision = matches / total if total > 0 else 0
             precisions.append(precision)
@@ -91,7 +136,7 @@ class TranslationEvaluator:
         
         return round(bleu_score, 2)
     
-    def calculate_chrf(self, reference, hypothesis, n=6, beta=2.0):
+    def calculate_chrf(self, reference, hypothesis, n=6, beta=2.0, ref_counts=None):
         """
         Calculate ChrF score (Character n-gram F-score)
         
@@ -100,25 +145,33 @@ class TranslationEvaluator:
             hypothesis: Hypothesis translation
             n: Maximum character n-gram size (default: 6)
             beta: Beta parameter for F-score (default: 2.0)
+            ref_counts: Optional precomputed reference n-gram counts by order
             
         Returns:
             ChrF score (0-100)
         """
+        # Normalize once instead of once per n-gram order
+        ref_chars = reference.lower().replace(' ', '')
+        hyp_chars = hypothesis.lower().replace(' ', '')
+        
         # Get character n-grams
         chrf_scores = []
         
         for i in range(1, n + 1):
-            ref_ngrams = Counter(self.get_char_ngrams(reference, i))
-            hyp_ngrams = Counter(self.get_char_ngrams(hypothesis, i))
+            if ref_counts and i in ref_counts:
+                ref_ngrams = ref_counts[i]
+            else:
+                ref_ngrams = Counter(ref_chars[j:j+i] for j in range(len(ref_chars)-i+1))
+            hyp_ngrams = Counter(hyp_chars[j:j+i] for j in range(len(hyp_chars)-i+1))
             
             if not hyp_ngrams or not ref_ngrams:
                 continue
             
-            # Calculate precision and recall
+            # Calculate precision and recall (n-gram totals follow from the lengths)
             matches = sum((hyp_ngrams & ref_ngrams).values())
             
-            precision = matches / sum(hyp_ngrams.values()) if sum(hyp_ngrams.values()) > 0 else 0
-            recall = matches / sum(ref_ngrams.values()) if sum(ref_ngrams.values()) > 0 else 0
+            precision = matches / (len(hyp_chars) - i + 1)
+            recall = matches / (len(ref_chars) - i + 1)
             
             # Calculate F-score
             if precision + recall > 0:
@@ -149,25 +202,29 @@ class TranslationEvaluator:
         Returns:
             METEOR score (0-100)
         """
-        ref_tokens = self.tokenize(reference)
-        hyp_tokens = self.tokenize(hypothesis)
-        
+        return self._meteor_from_tokens(self.tokenize(reference), self.tokenize(hypothesis))
+    
+    def _meteor_from_tokens(self, ref_tokens, hyp_tokens):
+        """METEOR on pre-tokenized input"""
         if not hyp_tokens or not ref_tokens:
             return 0.0
         
-        # Find matches
-        ref_matched = set()
+        # Unmatched reference positions per token, in order
+        ref_positions = defaultdict(deque)
+        for j, ref_token in enumerate(ref_tokens):
+            ref_positions[ref_token].append(j)
+        
+        # Exact matching - each hypothesis token takes the earliest
+        # unmatched reference position of the same token
         hyp_matched = set()
         matches = 0
         
-        # Exact matching
         for i, hyp_token in enumerate(hyp_tokens):
-            for j, ref_token in enumerate(ref_tokens):
-                if hyp_token == ref_token and j not in ref_matched:
-                    matches += 1
-                    ref_matched.add(j)
-                    hyp_matched.add(i)
-                    break
+            positions = ref_positions.get(hyp_token)
+            if positions:
+                positions.popleft()
+                matches += 1
+                hyp_matched.add(i)
         
         # Calculate precision and recall
         precision = matches / len(hyp_tokens) if len(hyp_tokens) > 0 else 0
@@ -213,8 +270,12 @@ class TranslationEvaluator:
         Returns:
             Simplified BERTScore (0-100)
         """
-        ref_tokens = set(self.tokenize(reference))
-        hyp_tokens = set(self.tokenize(hypothesis))
+        return self._bertscore_from_tokens(self.tokenize(reference), self.tokenize(hypothesis))
+    
+    def _bertscore_from_tokens(self, ref_tokens, hyp_tokens):
+        """Simplified BERTScore on pre-tokenized input"""
+        ref_tokens = set(ref_tokens)
+        hyp_tokens = set(hyp_tokens)
         
         if not hyp_tokens or not ref_tokens:
             return 0.0
@@ -254,18 +315,43 @@ class TranslationEvaluator:
                 'error': 'Empty input'
             }
         
+        # Results are deterministic, so serve repeats from the cache
+        cache_key = self._cache_key(reference, hypothesis)
+        if cache_key in self.cache:
+            self.cache.move_to_end(cache_key)
+            return dict(self.cache[cache_key])
+        
         try:
-            bleu = self.calculate_bleu(reference, hypothesis)
-            chrf = self.calculate_chrf(reference, hypothesis)
-            meteor = self.calculate_meteor(reference, hypothesis)
-            bertscore = self.calculate_bertscore(reference, hypothesis)
+            # Tokenize once and share across the word-level metrics; the
+            # reference side comes from the profile cache when seen before
+            profile = self._reference_profile(reference)
+            ref_tokens = profile['tokens']
+            hyp_tokens = self.tokenize(hypothesis)
             
-            return {
+            chrf = self.calculate_chrf(reference, hypothesis, ref_counts=profile['char_ngrams'])
+            
+            # Every word-level metric is 0 when either side has no words
+            # (e.g. punctuation-only segments), so skip them in one check
+            if ref_tokens and hyp_tokens:
+                bleu = self._bleu_from_tokens(ref_tokens, hyp_tokens, ref_counts=profile['word_ngrams'])
+                meteor = self._meteor_from_tokens(ref_tokens, hyp_tokens)
+                bertscore = self._bertscore_from_tokens(ref_tokens, hyp_tokens)
+            else:
+                bleu = meteor = bertscore = 0.0
+            
+            result = {
                 'bleu': bleu,
                 'chrf': chrf,
                 'meteor': meteor,
                 'bertscore': bertscore
             }
+            
+            if self.max_cache_size > 0:
+                self.cache[cache_key] = result
+                if len(self.cache) > self.max_cache_size:
+                    self.cache.popitem(last=False)
+            
+            return dict(result)
         except Exception as e:
             return {
                 'bleu': 0.0,